@@ -1,7 +1,17 @@
 import re
+import threading
+from concurrent.futures import Future
+
+import pytest
 
 from shared.enums import ContentType
-from shared.generation.templates import generate_items
+from shared.generation import templates
+from shared.generation.templates import (
+    _build_matching_llm_pairs_pool,
+    _matching_left_identifier,
+    _matching_pairs_are_exportable,
+    generate_items,
+)
 from shared.llm.providers import LLMProvider
 
 
@@ -200,6 +210,39 @@ class AssociationRefinementProvider(LLMProvider):
         """.strip()
 
 
+class ShortPairsPoolProvider(LLMProvider):
+    def __init__(self) -> None:
+        self.prompts: list[str] = []
+
+    def generate(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if len(self.prompts) == 1:
+            return """
+{
+  "pairs": [
+    {
+      "left": "Reseau parfait",
+      "right": "Le reseau parfait garantit une transmission sans perte et un delai de traversee stable."
+    }
+  ]
+}
+            """.strip()
+        return """
+{
+  "pairs": [
+    {
+      "left": "Reseau parfait",
+      "right": "Le reseau parfait est un modele ideal ou chaque trame arrive intacte et dans l'ordre."
+    },
+    {
+      "left": "Protocole de repetition",
+      "right": "Le protocole de repetition renvoie une trame quand l'accuse de reception attendu est absent."
+    }
+  ]
+}
+        """.strip()
+
+
 class GenericAssociationLabelsProvider(LLMProvider):
     def generate(self, prompt: str) -> str:
         return """
@@ -525,6 +568,76 @@ def test_pronote_association_mode_uses_llm_refinement_pool_when_available() -> N
     assert "cote chef cuisinier" not in lowered and "côté chef cuisinier" not in lowered
 
 
+class PairsThreadRecordingProvider(AssociationRefinementProvider):
+    def __init__(self) -> None:
+        self.pairs_threads: list[str] = []
+
+    def generate(self, prompt: str) -> str:
+        if '"pairs"' in prompt:
+            self.pairs_threads.append(threading.current_thread().name)
+        return super().generate(prompt)
+
+
+def test_concurrent_matching_pool_matches_sequential_generation() -> None:
+    kwargs = {
+        "source_text": (
+            "Le reseau parfait est une situation sans perte et avec un temps de traversee constant. "
+            "Le protocole de repetition permet de renvoyer la lettre manquante en cas d'accuse absent. "
+            "Le recepteur confirme la bonne reception et signale les lettres manquantes."
+        ),
+        "content_types": [ContentType.MATCHING],
+        "instructions": 'PRONOTE_MODES_JSON: {"association_pairs": 1}',
+        "max_items": 1,
+        "language": "fr",
+        "level": "intermediate",
+    }
+
+    sequential_provider = PairsThreadRecordingProvider()
+    concurrent_provider = PairsThreadRecordingProvider()
+    sequential = generate_items(provider=sequential_provider, **kwargs)
+    concurrent = generate_items(provider=concurrent_provider, **kwargs, concurrent_matching_pool=True)
+
+    assert [item.model_dump() for item in concurrent] == [item.model_dump() for item in sequential]
+    assert sequential_provider.pairs_threads
+    assert not any(name.startswith("llm-matching-pool") for name in sequential_provider.pairs_threads)
+    assert concurrent_provider.pairs_threads
+    assert all(name.startswith("llm-matching-pool") for name in concurrent_provider.pairs_threads)
+
+
+class FailingItemsProvider(LLMProvider):
+    def generate(self, prompt: str) -> str:
+        raise RuntimeError("items pass failed")
+
+
+class PendingExecutor:
+    def __init__(self) -> None:
+        self.futures: list[Future[list[tuple[str, str]]]] = []
+
+    def submit(self, fn, /, **kwargs) -> Future[list[tuple[str, str]]]:
+        future: Future[list[tuple[str, str]]] = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_concurrent_matching_pool_is_cancelled_when_primary_generation_fails(monkeypatch) -> None:
+    executor = PendingExecutor()
+    monkeypatch.setattr(templates, "_get_llm_executor", lambda: executor)
+
+    with pytest.raises(RuntimeError, match="items pass failed"):
+        generate_items(
+            provider=FailingItemsProvider(),
+            source_text="Le reseau parfait est une situation sans perte et avec un temps de traversee constant.",
+            content_types=[ContentType.MATCHING],
+            instructions='PRONOTE_MODES_JSON: {"association_pairs": 1}',
+            max_items=1,
+            language="fr",
+            level="intermediate",
+            concurrent_matching_pool=True,
+        )
+
+    assert len(executor.futures) == 1
+    assert executor.futures[0].cancelled()
+
 def test_pronote_association_mode_filters_generic_labels_and_keeps_clean_prompt() -> None:
     items = generate_items(
         provider=GenericAssociationLabelsProvider(),
@@ -670,3 +783,23 @@ def test_matching_mode_without_pronote_instructions_still_rebuilds_broken_pairs(
         assert not left.lower().startswith(("on ", "toutes "))
         assert not right.lower().startswith(("est-a-dire", "c'est-a-dire", "on suppose"))
         assert "est le suivant" not in right.lower()
+
+
+def test_matching_pairs_pool_retry_requests_only_the_shortfall_and_merges() -> None:
+    provider = ShortPairsPoolProvider()
+    pairs = _build_matching_llm_pairs_pool(
+        provider=provider,
+        source_text="Le reseau parfait est une situation sans perte et avec un temps de traversee constant.",
+        desired_pairs=8,
+        language="fr",
+        level="intermediate",
+        subject=None,
+        class_level=None,
+    )
+
+    assert len(provider.prompts) == 2
+    assert "exactement 7 paires" in provider.prompts[1]
+    assert "Notions deja retenues (ne pas les reprendre): Reseau parfait" in provider.prompts[1]
+    assert [left for left, _ in pairs] == ["Reseau parfait", "Protocole de repetition"]
+    assert len({_matching_left_identifier(left) for left, _ in pairs}) == len(pairs)
+    assert _matching_pairs_are_exportable(pairs)
@@ -9,6 +9,7 @@ import re
 from tempfile import TemporaryDirectory
 import time
 
+from shared.config import get_settings
 from shared.db import SessionLocal
 from shared.enums import ContentType, JobStatus, ProjectState, SourceType
 from shared.exporters.registry import get_exporters
@@ -146,6 +147,7 @@ def generate_content_task(
                 subject=subject,
                 class_level=class_level,
                 difficulty_target=difficulty_target,
+                concurrent_matching_pool=get_settings().enable_concurrent_matching_pool,
             )
             _update_job_running(job_id, progress=68, message=f"{len(items)} items generated")
 
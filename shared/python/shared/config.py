@@ -41,6 +41,7 @@ class Settings(BaseSettings):
     ocr_language: str = "fra+eng"
     enable_table_extraction_default: bool = True
     enable_smart_cleaning_default: bool = True
+    enable_concurrent_matching_pool: bool = True
 
     ingest_service_url: str = "http://ingest:8000"
     generate_service_url: str = "http://generate:8000"
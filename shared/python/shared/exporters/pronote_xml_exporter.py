@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import re
+import sys
+from typing import Callable, TextIO
 import unicodedata
 import xml.etree.ElementTree as ET
 
 from shared.exporters.base import BaseExporter
-from shared.schemas import ContentSetResponse, ExportArtifact
+from shared.schemas import ContentItemOut, ContentSetResponse, ExportArtifact
+
+try:  # pragma: no cover - optional dependency
+    from lxml import etree as LET
+except Exception:  # pragma: no cover - optional dependency fallback
+    LET = None  # type: ignore[assignment]
 
 CLOZE_PLACEHOLDER_PATTERN = re.compile(
     r"(_{3,}|\{\{blank\}\}|\[blank\]|\(blank\))", flags=re.IGNORECASE
@@ -427,6 +435,10 @@ MATCHING_LEFT_FORBIDDEN_TOKENS: set[str] = {
     "maintenant",
 }
 MATCHING_RIGHT_MIN_WORDS = 3
+ROWS_FLUSH_THRESHOLD = 512
+MATCHING_ITEM_TAGS: frozenset[str] = frozenset({"matching", "association_pairs", "association"})
+# Keys shorter than this are interned when deduplicating matching pairs.
+MATCHING_KEY_INTERN_MAX_LENGTH = 64
 
 # ── Blocklists for junk answers generated by fallback distractors ──────
 _JUNK_ANSWER_LOWER: set[str] = {
@@ -610,6 +622,9 @@ def _cdata(value: str) -> str:
     return f"<![CDATA[{safe}]]>"
 
 
+_EMPTY_CDATA = _cdata("")
+
+
 def _strip_html(value: str) -> str:
     return re.sub(r"<[^>]+>", " ", value or "")
 
@@ -637,6 +652,11 @@ def _split_expected_answers(value: str | None) -> list[str]:
 
 
 def _dedupe_non_empty(values: list[str]) -> list[str]:
+    return list(_dedupe_tuple(tuple(values)))
+
+
+@lru_cache(maxsize=2048)
+def _dedupe_tuple(values: tuple[str, ...]) -> tuple[str, ...]:
     seen: set[str] = set()
     deduped: list[str] = []
     for value in values:
@@ -648,7 +668,13 @@ def _dedupe_non_empty(values: list[str]) -> list[str]:
             continue
         seen.add(key)
         deduped.append(normalized)
-    return deduped
+    return tuple(deduped)
+
+
+def _intern_short(value: str) -> str:
+    if len(value) < MATCHING_KEY_INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
 
 
 def _derive_name(prompt: str) -> str:
@@ -932,19 +958,21 @@ def _matching_pair_quality_score(left: str, right: str) -> int:
 
 
 def _select_best_matching_pairs(
-    candidates: list[tuple[int, str, str, int]],
+    candidates: list[tuple[str, str, int]],
     *,
     limit: int,
 ) -> list[tuple[str, str]]:
     if limit <= 0 or not candidates:
         return []
 
-    ranked = sorted(candidates, key=lambda row: (-row[3], row[0]))
-    selected: list[tuple[int, str, str]] = []
+    # sorted() is stable, so insertion order breaks score ties.
+    ranked = sorted(range(len(candidates)), key=lambda index: -candidates[index][2])
+    selected: list[int] = []
     seen_left: set[str] = set()
     seen_right: set[str] = set()
 
-    for index, left, right, _score in ranked:
+    for index in ranked:
+        left, right, _score = candidates[index]
         left_id = _normalize_identifier(_strip_matching_leading_articles(left))
         right_id = _normalize_identifier(right)
         if not left_id or not right_id:
@@ -953,12 +981,12 @@ def _select_best_matching_pairs(
             continue
         seen_left.add(left_id)
         seen_right.add(right_id)
-        selected.append((index, left, right))
+        selected.append(index)
         if len(selected) >= limit:
             break
 
-    selected.sort(key=lambda row: row[0])
-    return [(left, right) for _, left, right in selected]
+    selected.sort()
+    return [candidates[index][:2] for index in selected]
 
 
 def _mcq_distractors(correct: str, distractors: list[str], answer_options: list[str]) -> list[str]:
@@ -1269,10 +1297,9 @@ def _build_cloze_text(prompt: str, correct_answers: list[str], distractors: list
 def _extract_matching_pairs(
     item_correct_answer: str | None, answer_options: list[str]
 ) -> list[tuple[str, str]]:
-    def parse_chunks(chunks: list[str]) -> list[tuple[int, str, str, int]]:
-        candidates: list[tuple[int, str, str, int]] = []
+    def parse_chunks(chunks: list[str]) -> list[tuple[str, str, int]]:
+        candidates: list[tuple[str, str, int]] = []
         seen_exact: set[tuple[str, str]] = set()
-        sequence = 0
         for chunk in chunks:
             if not chunk:
                 continue
@@ -1320,12 +1347,11 @@ def _extract_matching_pairs(
                     if not _is_valid_matching_pair(left, right):
                         continue
                     left = _normalize_matching_left_display(left)
-                    key = (left.lower(), right.lower())
+                    key = (_intern_short(left.lower()), _intern_short(right.lower()))
                     if key in seen_exact:
                         continue
                     seen_exact.add(key)
-                    sequence += 1
-                    candidates.append((sequence, left, right, _matching_pair_quality_score(left, right)))
+                    candidates.append((left, right, _matching_pair_quality_score(left, right)))
         return candidates
 
     # Priorite aux paires validees dans correct_answer. Les answer_options servent
@@ -1342,12 +1368,11 @@ def _extract_matching_pairs(
 def _looks_like_matching_item(item_type_value: str, tags: list[str], correct: str, answer_options: list[str]) -> bool:
     if item_type_value == "matching":
         return True
-    lowered_tags = {tag.strip().lower() for tag in tags if tag}
-    if {"matching", "association_pairs", "association"} & lowered_tags:
-        return True
     if "->" in correct:
         return True
-    return any("->" in (option or "") for option in answer_options)
+    if any("->" in option for option in answer_options if option):
+        return True
+    return any(tag.strip().lower() in MATCHING_ITEM_TAGS for tag in tags if tag)
 
 
 def _append_multichoice(rows: list[str], prompt: str, correct: str, distractors: list[str]) -> None:
@@ -1380,38 +1405,32 @@ def _append_multichoice_generic(
         max(1, round(100 / len(normalized_correct)))
     )
 
-    rows.extend(
-        [
-            '<question type="multichoice">',
-            f"  <name><text>{_cdata('')}</text></name>",
-            '  <questiontext format="plain_text">',
-            f"    <text>{_cdata(prompt)}</text>",
-            "  </questiontext>",
-            "  <externallink/>",
-            "  <usecase>1</usecase>",
-            "  <defaultgrade>1</defaultgrade>",
-            "  <editeur>0</editeur>",
-            f"  <single>{'true' if single else 'false'}</single>",
-            "  <shuffleanswers>true</shuffleanswers>",
-        ]
+    rows.append(
+        f"""<question type="multichoice">
+  <name><text>{_EMPTY_CDATA}</text></name>
+  <questiontext format="plain_text">
+    <text>{_cdata(prompt)}</text>
+  </questiontext>
+  <externallink/>
+  <usecase>1</usecase>
+  <defaultgrade>1</defaultgrade>
+  <editeur>0</editeur>
+  <single>{'true' if single else 'false'}</single>
+  <shuffleanswers>true</shuffleanswers>"""
     )
     for correct in normalized_correct:
-        rows.extend(
-            [
-                f'  <answer fraction="{answer_fraction}" format="plain_text">',
-                f"    <text>{_cdata(correct)}</text>",
-                f"    <feedback><text>{_cdata('')}</text></feedback>",
-                "  </answer>",
-            ]
+        rows.append(
+            f'  <answer fraction="{answer_fraction}" format="plain_text">\n'
+            f"    <text>{_cdata(correct)}</text>\n"
+            f"    <feedback><text>{_EMPTY_CDATA}</text></feedback>\n"
+            "  </answer>"
         )
     for distractor in normalized_distractors:
-        rows.extend(
-            [
-                '  <answer fraction="0" format="plain_text">',
-                f"    <text>{_cdata(distractor)}</text>",
-                f"    <feedback><text>{_cdata('')}</text></feedback>",
-                "  </answer>",
-            ]
+        rows.append(
+            '  <answer fraction="0" format="plain_text">\n'
+            f"    <text>{_cdata(distractor)}</text>\n"
+            f"    <feedback><text>{_EMPTY_CDATA}</text></feedback>\n"
+            "  </answer>"
         )
     rows.append("</question>")
 
@@ -1420,86 +1439,201 @@ def _append_cloze(
     rows: list[str], prompt: str, correct_answers: list[str], distractors: list[str]
 ) -> None:
     cloze_text = _build_cloze_text(prompt, correct_answers, distractors)
-    rows.extend(
-        [
-            '<question type="cloze" desc="variable">',
-            f"  <name><text>{_cdata(_derive_name(prompt))}</text></name>",
-            '  <questiontext format="html">',
-            f"    <text>{_cdata(cloze_text)}</text>",
-            "  </questiontext>",
-            "  <externallink/>",
-            "  <usecase>1</usecase>",
-            "  <defaultgrade>1</defaultgrade>",
-            "  <editeur>0</editeur>",
-            "</question>",
-        ]
-    )
+    _append_cloze_raw(rows, prompt_name=prompt, cloze_text=cloze_text)
 
 
 def _append_cloze_raw(
     rows: list[str], *, prompt_name: str, cloze_text: str
 ) -> None:
     """Append a cloze question from pre-built cloze text (already validated)."""
-    rows.extend(
-        [
-            '<question type="cloze" desc="variable">',
-            f"  <name><text>{_cdata(_derive_name(prompt_name))}</text></name>",
-            '  <questiontext format="html">',
-            f"    <text>{_cdata(cloze_text)}</text>",
-            "  </questiontext>",
-            "  <externallink/>",
-            "  <usecase>1</usecase>",
-            "  <defaultgrade>1</defaultgrade>",
-            "  <editeur>0</editeur>",
-            "</question>",
-        ]
+    rows.append(
+        f"""<question type="cloze" desc="variable">
+  <name><text>{_cdata(_derive_name(prompt_name))}</text></name>
+  <questiontext format="html">
+    <text>{_cdata(cloze_text)}</text>
+  </questiontext>
+  <externallink/>
+  <usecase>1</usecase>
+  <defaultgrade>1</defaultgrade>
+  <editeur>0</editeur>
+</question>"""
     )
 
 
 def _append_matching(rows: list[str], prompt: str, pairs: list[tuple[str, str]]) -> None:
+    rows.append(
+        f"""<question type="matching">
+  <name><text>{_cdata(_derive_name(prompt))}</text></name>
+  <questiontext format="html">
+    <text>{_cdata(prompt)}</text>
+  </questiontext>
+  <externallink/>
+  <usecase>1</usecase>
+  <defaultgrade>1</defaultgrade>
+  <editeur>0</editeur>"""
+    )
     rows.extend(
-        [
-            '<question type="matching">',
-            f"  <name><text>{_cdata(_derive_name(prompt))}</text></name>",
-            '  <questiontext format="html">',
-            f"    <text>{_cdata(prompt)}</text>",
-            "  </questiontext>",
-            "  <externallink/>",
-            "  <usecase>1</usecase>",
-            "  <defaultgrade>1</defaultgrade>",
-            "  <editeur>0</editeur>",
-        ]
+        f"""  <subquestion>
+    <text>{_cdata(left)}</text>
+    <answer>
+      <text>{_cdata(right)}</text>
+    </answer>
+  </subquestion>"""
+        for left, right in pairs
     )
-    for left, right in pairs:
-        rows.extend(
-            [
-                "  <subquestion>",
-                f"    <text>{_cdata(left)}</text>",
-                "    <answer>",
-                f"      <text>{_cdata(right)}</text>",
-                "    </answer>",
-                "  </subquestion>",
-            ]
-        )
-    rows.extend(["  <shuffleanswers>true</shuffleanswers>", "</question>"])
+    rows.append("  <shuffleanswers>true</shuffleanswers>\n</question>")
+
+
+def _append_mcq_item(
+    rows: list[str], item: ContentItemOut, *, prompt: str, correct: str, answer_options: list[str]
+) -> bool:
+    expected_answers = [
+        a for a in _split_expected_answers(correct) if not _is_junk_answer(a)
+    ]
+    if not expected_answers:
+        fallback = [v for v in _dedupe_non_empty(item.answer_options) if not _is_junk_answer(v)]
+        if fallback:
+            expected_answers = [fallback[0]]
+    if not expected_answers:
+        return False
+    mcq_correct = expected_answers[0]
+    distractors = _mcq_distractors(mcq_correct, item.distractors, answer_options)
+    if not distractors:
+        return False
+    _append_multichoice(rows, prompt=prompt, correct=mcq_correct, distractors=distractors)
+    return True
 
 
-def _validate_pronote_xml(xml_payload: str) -> None:
-    root = ET.fromstring(xml_payload)
-    for question in root.findall("question"):
-        question_type = question.get("type", "")
-        if question_type != "multichoice":
+def _append_poll_item(
+    rows: list[str], item: ContentItemOut, *, prompt: str, correct: str, answer_options: list[str]
+) -> bool:
+    expected_answers = [
+        a for a in _split_expected_answers(correct) if not _is_junk_answer(a)
+    ]
+    if not expected_answers:
+        return False
+    options = _dedupe_non_empty([*answer_options, *item.distractors, *expected_answers])
+    expected_lower = {value.lower() for value in expected_answers}
+    distractors = [
+        value for value in options
+        if value.lower() not in expected_lower and not _is_junk_answer(value)
+    ]
+    if not distractors:
+        return False
+    _append_multichoice_generic(
+        rows=rows,
+        prompt=prompt,
+        correct_answers=expected_answers,
+        distractors=distractors,
+        single=False,
+    )
+    return True
+
+
+def _append_cloze_item(
+    rows: list[str], item: ContentItemOut, *, prompt: str, correct: str, answer_options: list[str]
+) -> bool:
+    # ── Skip "Associez" cloze: these are broken matching questions ──
+    if re.match(r"^\s*Associez\b", prompt, flags=re.IGNORECASE):
+        return False
+
+    has_inline_token = "{:MULTICHOICE:" in prompt
+    cloze_correct = _split_expected_answers(correct)
+    if not has_inline_token and not cloze_correct:
+        return False
+    seed_distractors = _dedupe_non_empty([*item.distractors, *answer_options])
+
+    # Build cloze text first, then validate before appending
+    cloze_text = _build_cloze_text(prompt, cloze_correct, seed_distractors)
+    if not cloze_text or not CLOZE_TOKEN_PATTERN.search(cloze_text):
+        return False  # Drop: no valid tokens remain after repair
+
+    _append_cloze_raw(rows, prompt_name=prompt, cloze_text=cloze_text)
+    return True
+
+
+def _append_matching_item(
+    rows: list[str], item: ContentItemOut, *, prompt: str, correct: str, answer_options: list[str]
+) -> bool:
+    item_tags = [tag for tag in item.tags if isinstance(tag, str)]
+    if not _looks_like_matching_item(item.item_type.value, item_tags, correct, answer_options):
+        return False
+    pairs = _extract_matching_pairs(correct, answer_options)
+    if len(pairs) < 2:
+        return False
+    _append_matching(rows, prompt=prompt, pairs=pairs)
+    return True
+
+
+# Item types without a dedicated appender are exported as matching when they look like one.
+_ITEM_TYPE_APPENDERS: dict[str, Callable[..., bool]] = {
+    "mcq": _append_mcq_item,
+    "poll": _append_poll_item,
+    "cloze": _append_cloze_item,
+}
+
+
+def _validate_pronote_xml(file_path: Path) -> None:
+    """Stream the written quiz and reject multichoice questions without an expected answer."""
+
+    iterparse = LET.iterparse if LET is not None else ET.iterparse
+    depth = 0
+    in_multichoice = False
+    has_expected = False
+    for event, element in iterparse(str(file_path), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2 and element.tag == "question":
+                in_multichoice = element.get("type", "") == "multichoice"
+                has_expected = False
+            continue
+        depth -= 1
+        if depth == 2 and in_multichoice and element.tag == "answer" and not has_expected:
+            fraction = (element.get("fraction") or "").strip()
+            text = _normalize_text(element.findtext("text") or "")
+            has_expected = bool(text and fraction and fraction != "0")
+        elif depth == 1 and element.tag == "question":
+            if in_multichoice and not has_expected:
+                raise ValueError("Question multichoix invalide: reponse attendue manquante.")
+            in_multichoice = False
+            element.clear()
+
+
+def _write_question_rows(handle: TextIO, rows: list[str], items: list[ContentItemOut]) -> int:
+    """Append every exportable item to *rows*, flushing to *handle* in bounded chunks."""
+
+    exported_count = 0
+    for item in items:
+        prompt = _normalize_text(item.prompt or "")
+        if not prompt:
+            continue
+        correct = _normalize_text(item.correct_answer or "")
+        item_type = item.item_type.value
+        answer_options = [value for value in item.answer_options if isinstance(value, str)]
+
+        # Skip tautological questions where correct answer ≈ prompt
+        if correct and len(correct) > 10:
+            prompt_lower = prompt.lower().replace(" ", "")
+            correct_lower = correct.lower().replace(" ", "")
+            if correct_lower in prompt_lower or prompt_lower in correct_lower:
+                continue
+
+        # Skip questions with garbled OCR in the prompt itself
+        if _OCR_GARBLED_PATTERN.search(prompt):
             continue
-        answers = question.findall("answer")
-        has_expected = False
-        for answer in answers:
-            fraction = (answer.get("fraction") or "").strip()
-            text = _normalize_text(answer.findtext("text") or "")
-            if text and fraction and fraction != "0":
-                has_expected = True
-                break
-        if not has_expected:
-            raise ValueError("Question multichoix invalide: reponse attendue manquante.")
+
+        append_item = _ITEM_TYPE_APPENDERS.get(item_type, _append_matching_item)
+        if append_item(rows, item, prompt=prompt, correct=correct, answer_options=answer_options):
+            exported_count += 1
+
+            if len(rows) >= ROWS_FLUSH_THRESHOLD:
+                handle.write("\n".join(rows))
+                handle.write("\n")
+                rows.clear()
+
+    rows.append("</quiz>")
+    handle.write("\n".join(rows))
+    return exported_count
 
 
 class PronoteXmlExporter(BaseExporter):
@@ -1545,105 +1679,16 @@ class PronoteXmlExporter(BaseExporter):
             ]
         )
 
-        exported_count = 0
-
-        for item in content_set.items:
-            prompt = _normalize_text(item.prompt or "")
-            if not prompt:
-                continue
-            correct = _normalize_text(item.correct_answer or "")
-            item_type = item.item_type.value
-            item_tags = [tag for tag in item.tags if isinstance(tag, str)]
-            answer_options = [value for value in item.answer_options if isinstance(value, str)]
-
-            # Skip tautological questions where correct answer ≈ prompt
-            if correct and len(correct) > 10:
-                prompt_lower = prompt.lower().replace(" ", "")
-                correct_lower = correct.lower().replace(" ", "")
-                if correct_lower in prompt_lower or prompt_lower in correct_lower:
-                    continue
-
-            # Skip questions with garbled OCR in the prompt itself
-            if _OCR_GARBLED_PATTERN.search(prompt):
-                continue
-
-            if item_type == "mcq":
-                expected_answers = [
-                    a for a in _split_expected_answers(correct) if not _is_junk_answer(a)
-                ]
-                if not expected_answers:
-                    fallback = [v for v in _dedupe_non_empty(item.answer_options) if not _is_junk_answer(v)]
-                    if fallback:
-                        expected_answers = [fallback[0]]
-                if not expected_answers:
-                    continue
-                mcq_correct = expected_answers[0]
-                distractors = _mcq_distractors(mcq_correct, item.distractors, answer_options)
-                if not distractors:
-                    continue
-                _append_multichoice(rows, prompt=prompt, correct=mcq_correct, distractors=distractors)
-                exported_count += 1
-                continue
-
-            if item_type == "poll":
-                expected_answers = [
-                    a for a in _split_expected_answers(correct) if not _is_junk_answer(a)
-                ]
-                if not expected_answers:
-                    continue
-                options = _dedupe_non_empty([*answer_options, *item.distractors, *expected_answers])
-                expected_lower = {value.lower() for value in expected_answers}
-                distractors = [
-                    value for value in options
-                    if value.lower() not in expected_lower and not _is_junk_answer(value)
-                ]
-                if not distractors:
-                    continue
-                _append_multichoice_generic(
-                    rows=rows,
-                    prompt=prompt,
-                    correct_answers=expected_answers,
-                    distractors=distractors,
-                    single=False,
-                )
-                exported_count += 1
-                continue
-
-            if item_type == "cloze":
-                # ── Skip "Associez" cloze: these are broken matching questions ──
-                if re.match(r"^\s*Associez\b", prompt, flags=re.IGNORECASE):
-                    continue
-
-                has_inline_token = "{:MULTICHOICE:" in prompt
-                cloze_correct = _split_expected_answers(correct)
-                if not has_inline_token and not cloze_correct:
-                    continue
-                seed_distractors = _dedupe_non_empty([*item.distractors, *answer_options])
-
-                # Build cloze text first, then validate before appending
-                cloze_text = _build_cloze_text(prompt, cloze_correct, seed_distractors)
-                if not cloze_text or not CLOZE_TOKEN_PATTERN.search(cloze_text):
-                    continue  # Drop: no valid tokens remain after repair
-
-                _append_cloze_raw(rows, prompt_name=prompt, cloze_text=cloze_text)
-                exported_count += 1
-                continue
-
-            if _looks_like_matching_item(item_type, item_tags, correct, answer_options):
-                pairs = _extract_matching_pairs(correct, answer_options)
-                if len(pairs) >= 2:
-                    _append_matching(rows, prompt=prompt, pairs=pairs)
-                    exported_count += 1
-                continue
-
-        if exported_count == 0:
-            raise ValueError("Aucune question exportable: ajoutez une reponse attendue pour chaque item.")
-
-        rows.append("</quiz>")
+        try:
+            with file_path.open("w", encoding="utf-8") as handle:
+                exported_count = _write_question_rows(handle, rows, content_set.items)
+            if exported_count == 0:
+                raise ValueError("Aucune question exportable: ajoutez une reponse attendue pour chaque item.")
+            _validate_pronote_xml(file_path)
+        except Exception:
+            file_path.unlink(missing_ok=True)
+            raise
 
-        xml_payload = "\n".join(rows)
-        _validate_pronote_xml(xml_payload)
-        file_path.write_text(xml_payload, encoding="utf-8")
         return ExportArtifact(
             artifact_path=str(file_path), mime="application/xml", filename=filename
         )
@@ -2,24 +2,125 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import threading
 import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from textwrap import dedent
-from typing import Any, Literal, Mapping
+from typing import Any, Collection, Iterator, Literal, Mapping, get_args
 
-from pydantic import BaseModel, Field, ValidationError
+from pydantic import BaseModel, Field
 
 from shared.enums import ContentType, ItemType
 from shared.llm.providers import LLMProvider
 from shared.schemas import GeneratedItem
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover - optional dependency fallback
+    orjson = None  # type: ignore[assignment]
+
 NOISY_SOURCE_LINE_PATTERN = re.compile(
     r"^\s*(source\s+(youtube|web)|lien|url|identifiant\s+video|transcription\s+(non\s+activee|indisponible)|generation\s+basee|recuperation\s+impossible|for\s+more\s+information\s+check|client\s+error|http\s+error|acces\s+refuse|access\s+denied)\b",
     flags=re.IGNORECASE,
 )
+YOUTUBE_METADATA_LINE_PATTERN = re.compile(r"^\s*(titre|chaine)\s*:", flags=re.IGNORECASE)
+# Single-pass line filter for YouTube payloads: noise lines or title/channel metadata.
+YOUTUBE_NOISY_SOURCE_LINE_PATTERN = re.compile(
+    rf"{NOISY_SOURCE_LINE_PATTERN.pattern}|{YOUTUBE_METADATA_LINE_PATTERN.pattern}",
+    flags=re.IGNORECASE,
+)
+# Unanchored supersets of the line filters: no hit anywhere means no line can be noisy.
+NOISY_SOURCE_HINT_PATTERN = re.compile(
+    NOISY_SOURCE_LINE_PATTERN.pattern.replace(r"^\s*", ""), flags=re.IGNORECASE
+)
+YOUTUBE_NOISY_SOURCE_HINT_PATTERN = re.compile(
+    YOUTUBE_NOISY_SOURCE_LINE_PATTERN.pattern.replace(r"^\s*", ""), flags=re.IGNORECASE
+)
 URL_PATTERN = re.compile(r"https?://\S+", flags=re.IGNORECASE)
+FENCED_JSON_BLOCK_PATTERN = re.compile(
+    r"```(?:json)?\s*([\[{].*?[\]}])\s*```", flags=re.DOTALL | re.IGNORECASE
+)
+YOUTUBE_SOURCE_HEADER_PATTERN = re.compile(r"^\s*source\s+youtube\s*:", flags=re.IGNORECASE | re.MULTILINE)
+SOURCE_LINE_EDGE_WHITESPACE_PATTERN = re.compile(r"[^\S \n]| \n|\n ")
+BLANK_LINE_RUN_PATTERN = re.compile(r"\n{3,}")
+INLINE_SPACE_RUN_PATTERN = re.compile(r"[ \t]{2,}")
+WHITESPACE_GAP_PATTERN = re.compile(r"\s{2,}")
+# Technical prefixes stripped from generated item fields.
+FIELD_SOURCE_PREFIX_PATTERN = re.compile(r"\bsource\s+(youtube|web)\s*:\s*", flags=re.IGNORECASE)
+FIELD_VIDEO_ID_PREFIX_PATTERN = re.compile(r"\bidentifiant\s+video\s*:\s*", flags=re.IGNORECASE)
+FIELD_TITLE_CHANNEL_PREFIX_PATTERN = re.compile(r"\b(titre|chaine)\s*:\s*", flags=re.IGNORECASE)
+FIELD_RECOVERY_ERROR_PREFIX_PATTERN = re.compile(
+    r"\brecuperation\s+impossible\s*:\s*", flags=re.IGNORECASE
+)
+FIELD_MORE_INFO_PREFIX_PATTERN = re.compile(
+    r"\bfor\s+more\s+information\s+check\s*:\s*", flags=re.IGNORECASE
+)
+FIELD_HTTP_ERROR_PREFIX_PATTERN = re.compile(
+    r"\b(client|http)\s+error\s*['\"]?\d{3}[^:]*:\s*", flags=re.IGNORECASE
+)
+FIELD_NOISE_PATTERNS: tuple[re.Pattern[str], ...] = (
+    URL_PATTERN,
+    FIELD_SOURCE_PREFIX_PATTERN,
+    FIELD_VIDEO_ID_PREFIX_PATTERN,
+    FIELD_TITLE_CHANNEL_PREFIX_PATTERN,
+    FIELD_RECOVERY_ERROR_PREFIX_PATTERN,
+    FIELD_MORE_INFO_PREFIX_PATTERN,
+    FIELD_HTTP_ERROR_PREFIX_PATTERN,
+)
+FIELD_NOISE_PATTERN = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in FIELD_NOISE_PATTERNS), flags=re.IGNORECASE
+)
+LIST_SEPARATOR_PATTERN = re.compile(r"[;\n|]+")
+# Folded identifiers are pure ASCII: map every character outside [a-z0-9_] to "_".
+IDENTIFIER_CHAR_TABLE: dict[int, str] = {
+    codepoint: "_" for codepoint in range(0x80) if not re.fullmatch(r"[a-z0-9_]", chr(codepoint))
+}
+IDENTIFIER_UNDERSCORE_RUN_PATTERN = re.compile(r"_+")
+MATCHING_ARROW_PATTERN = re.compile(r"->|=>|→|-&gt;")
+MATCHING_ITEM_TAGS: frozenset[str] = frozenset({"matching", "association_pairs", "association"})
+MATCHING_MODE_EXCLUDED_TAGS = frozenset(
+    {
+        "mcq",
+        "open_question",
+        "poll",
+        "cloze",
+        "matching",
+        "flashcard",
+        "course_structure",
+        "brainstorming",
+    }
+)
+CLOZE_PRONOTE_MODES = frozenset({"cloze_free", "cloze_list_unique", "cloze_list_variable"})
+JSON_OBJECT_SPAN_PATTERN = re.compile(r"\{[\s\S]*\}")
+ANSWER_LABEL_PREFIX_PATTERN = re.compile(r"^\s*reponse\s*[:\-]\s*", flags=re.IGNORECASE)
+ANSWER_PART_SEPARATOR_PATTERN = re.compile(r"\|\||;|\n")
+SPELLING_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]{2,}")
+SPELLING_STOP_TOKENS = frozenset({"quelle", "quelles", "comment", "pourquoi", "avec", "dans", "sans"})
+ASSOCIATION_PROMPT_PATTERN = re.compile(r"\bassoc(?:ier|iez|iation)\b", flags=re.IGNORECASE)
 PRONOTE_MODES_JSON_PREFIX = "PRONOTE_MODES_JSON:"
+JSON_DECODER = json.JSONDecoder()
+# Per-character NFKD + ASCII-drop over Latin-1 and Latin Extended-A/B, so folding
+# French text is a single str.translate; other scripts fall back to NFKD.
+ASCII_FOLD_TABLE: dict[int, str] = {
+    codepoint: unicodedata.normalize("NFKD", chr(codepoint)).encode("ascii", "ignore").decode("ascii")
+    for codepoint in range(0x80, 0x250)
+}
+# Substring (not word) match on the lower-cased class label, e.g. "1ereS", "TermBac".
+LYCEE_CLASS_PATTERN = re.compile(r"lycee|2de|seconde|1ere|premiere|terminale|bac")
+LLM_EXECUTOR_MAX_WORKERS = 4
+# Created lazily so forked workers (celery prefork) never inherit live threads.
+_LLM_EXECUTOR: ThreadPoolExecutor | None = None
+_LLM_EXECUTOR_LOCK = threading.Lock()
+SANITIZED_SOURCE_CACHE_SIZE = 32
+_SANITIZED_SOURCE_CACHE: OrderedDict[bytes, str] = OrderedDict()
+_SANITIZED_SOURCE_CACHE_LOCK = threading.Lock()
 NUMERIC_VALUE_PATTERN = re.compile(r"-?\d+(?:[.,]\d+)?")
 NUMERIC_PROMPT_PATTERN = re.compile(
     r"\b(combien|nombre|valeur|annee|duree|distance|age|pourcentage|taux|note|score|quantite)\b",
@@ -40,22 +141,24 @@ MATCHING_PLACEHOLDER_PATTERN = re.compile(
     r"^(definition\s+de|element\s+[a-z0-9]+|notion\s+[a-z0-9]+|terme\s+[a-z0-9]+)\b",
     flags=re.IGNORECASE,
 )
-MATCHING_STOPWORDS: set[str] = {
-    "comment",
-    "pourquoi",
-    "quelle",
-    "quelles",
-    "quoi",
-    "ou",
-    "quand",
-    "combien",
-    "liste",
-    "definition",
-    "question",
-    "reponse",
-    "associez",
-    "associer",
-}
+MATCHING_STOPWORDS: frozenset[str] = frozenset(
+    {
+        "comment",
+        "pourquoi",
+        "quelle",
+        "quelles",
+        "quoi",
+        "ou",
+        "quand",
+        "combien",
+        "liste",
+        "definition",
+        "question",
+        "reponse",
+        "associez",
+        "associer",
+    }
+)
 MATCHING_BAD_LEFT_PREFIX_PATTERN = re.compile(
     r"^\s*(on|il|elle|ils|elles|nous|vous|ce|cet|cette|cela|ceci|bien|toutes?|chaque)\b",
     flags=re.IGNORECASE,
@@ -64,22 +167,23 @@ MATCHING_LEFT_NOISY_PHRASE_PATTERN = re.compile(
     r"^\s*(?:on\s+suppose|bien\s+entendu|toutes?\s+les|les\s+donn[eé]es?|les\s+informations?)\b",
     flags=re.IGNORECASE,
 )
-MATCHING_LEFT_BAD_START_TOKENS: set[str] = {
-    "disponible",
-    "probablement",
-    "surement",
-    "sûrement",
-    "suivant",
-    "suivante",
-    "suivants",
-    "suivantes",
-    "quelques",
-    "plusieurs",
-    "exemple",
-    "exemples",
-    "cas",
-    "maintenant",
-}
+MATCHING_LEFT_BAD_START_TOKENS: frozenset[str] = frozenset(
+    {
+        "disponible",
+        "probablement",
+        "surement",
+        "suivant",
+        "suivante",
+        "suivants",
+        "suivantes",
+        "quelques",
+        "plusieurs",
+        "exemple",
+        "exemples",
+        "cas",
+        "maintenant",
+    }
+)
 MATCHING_RIGHT_NOISY_START_PATTERN = re.compile(
     r"^\s*(?:est\s+le\s+suivant|c['’]?\s*est\s*[-–]?\s*[aà]\s*[-–]?\s*dire|est\s*[-–]?\s*[aà]\s*[-–]?\s*dire|sont\s+probablement|il\s+pourrait\s+falloir)\b",
     flags=re.IGNORECASE,
@@ -92,8 +196,86 @@ MATCHING_RIGHT_BAD_END_PATTERN = re.compile(
     r"(?:\b(?:de|du|des|d['’]?|a|à|au|aux|pour|avec|sans|sur|sous|dans|en|par|vers|et|ou|que|qui|dont)\b|[:;,\-])\.?$",
     flags=re.IGNORECASE,
 )
+# Any match of the end-anchored pattern starts within this many trailing chars
+# (4-letter word + "." + a final "\n" that "$" may precede).
+MATCHING_RIGHT_BAD_END_WINDOW = 8
+# Conjugated predicate verbs shared by the left-label verb filter and the
+# banned label tokens (ASCII spellings; accented ones are derived below).
+MATCHING_PREDICATE_VERBS: tuple[str, ...] = (
+    "est",
+    "sont",
+    "decrit",
+    "decrivent",
+    "signifie",
+    "signifient",
+    "indique",
+    "indiquent",
+    "explique",
+    "expliquent",
+    "definit",
+    "definissent",
+    "represente",
+    "representent",
+    "caracterise",
+    "caracterisent",
+    "envoie",
+    "envoient",
+    "renvoie",
+    "renvoient",
+    "limite",
+    "limitent",
+    "transmet",
+    "transmettent",
+    "recoit",
+    "recoivent",
+    "declenche",
+    "declenchent",
+    "active",
+    "activent",
+)
+MATCHING_PREDICATE_VERB_ACCENTED_SPELLINGS: dict[str, str] = {
+    "decrit": "décrit",
+    "decrivent": "décrivent",
+    "definit": "définit",
+    "definissent": "définissent",
+    "represente": "représente",
+    "representent": "représentent",
+    "caracterise": "caractérise",
+    "caracterisent": "caractérisent",
+    "recoit": "reçoit",
+    "recoivent": "reçoivent",
+    "declenche": "déclenche",
+    "declenchent": "déclenchent",
+}
+MATCHING_LEFT_EXTRA_VERBS: tuple[str, ...] = (
+    "sera",
+    "seront",
+    "doit",
+    "doivent",
+    "peut",
+    "peuvent",
+    "faut",
+    "suppose",
+    "considere",
+    "considerent",
+    "arrive",
+    "arrivent",
+    "perd",
+    "perdent",
+)
 MATCHING_LEFT_VERB_PATTERN = re.compile(
-    r"\b(est|sont|sera|seront|doit|doivent|peut|peuvent|faut|suppose|considere|considerent|arrive|arrivent|perd|perdent|decrit|decrivent|décrit|décrivent|signifie|signifient|indique|indiquent|explique|expliquent|definit|definissent|définit|définissent|represente|representent|représente|représentent|caracterise|caracterisent|caractérise|caractérisent|envoie|envoient|renvoie|renvoient|limite|limitent|transmet|transmettent|recoit|reçoit|recoivent|reçoivent|declenche|déclenche|declenchent|déclenchent|active|activent)\b",
+    r"\b("
+    + "|".join(
+        sorted(
+            {
+                *MATCHING_PREDICATE_VERBS,
+                *MATCHING_PREDICATE_VERB_ACCENTED_SPELLINGS.values(),
+                *MATCHING_LEFT_EXTRA_VERBS,
+            },
+            key=lambda verb: (-len(verb), verb),
+        )
+    )
+    + r")\b",
     flags=re.IGNORECASE,
 )
 MATCHING_DEFINITION_PREFIX_PATTERN = re.compile(
@@ -126,7 +308,7 @@ MATCHING_LEFT_ARTICLE_PHRASE_PATTERN = re.compile(
     flags=re.IGNORECASE,
 )
 MATCHING_WEAK_DEFINITION_PATTERN = re.compile(
-    r"^(?:est|sont)\s+(?:le|la|les)\s+suivan(?:t|te|ts|tes)\b",
+    r"(?:est|sont)\s+(?:le|la|les)\s+suivan(?:t|te|ts|tes)\b",
     flags=re.IGNORECASE,
 )
 MATCHING_INTRO_NOISE_PATTERN = re.compile(
@@ -142,203 +324,158 @@ MATCHING_WEAK_CERTAINTY_PATTERN = re.compile(
     r"\b(probablement|s[ûu]rement)\b",
     flags=re.IGNORECASE,
 )
-MATCHING_LABEL_BANNED_TOKENS: set[str] = {
-    "est",
-    "sont",
-    "decrit",
-    "decrivent",
-    "décrit",
-    "décrivent",
-    "signifie",
-    "signifient",
-    "indique",
-    "indiquent",
-    "explique",
-    "expliquent",
-    "definit",
-    "definissent",
-    "définit",
-    "définissent",
-    "represente",
-    "representent",
-    "représente",
-    "représentent",
-    "caracterise",
-    "caracterisent",
-    "caractérise",
-    "caractérisent",
-    "garantit",
-    "garantissent",
-    "envoie",
-    "envoient",
-    "renvoie",
-    "renvoient",
-    "limite",
-    "limitent",
-    "transmet",
-    "transmettent",
-    "recoit",
-    "reçoit",
-    "recoivent",
-    "reçoivent",
-    "declenche",
-    "déclenche",
-    "declenchent",
-    "déclenchent",
-    "active",
-    "activent",
-    "probablement",
-    "surement",
-    "sûrement",
-}
+MATCHING_LABEL_BANNED_TOKENS: frozenset[str] = frozenset(
+    (*MATCHING_PREDICATE_VERBS, "garantit", "garantissent", "probablement", "surement")
+)
+# ASCII spellings of the articles _strip_leading_label accepts before a label.
+MATCHING_LABEL_ARTICLES: tuple[str, ...] = ("l'", "le", "la", "les", "un", "une", "des", "du")
 MATCHING_LEADING_ARTICLE_PATTERN = re.compile(
     r"^(?:l['’]|d['’]|le|la|les|un|une|des|du|de|au|aux)\s*",
     flags=re.IGNORECASE,
 )
-MATCHING_GENERIC_TOKEN_STOPWORDS: set[str] = {
-    "le",
-    "la",
-    "les",
-    "un",
-    "une",
-    "des",
-    "du",
-    "de",
-    "d",
-    "l",
-    "au",
-    "aux",
-    "on",
-    "bien",
-    "entendu",
-    "ainsi",
-    "alors",
-    "donc",
-    "tout",
-    "tous",
-    "toute",
-    "toutes",
-    "chaque",
-    "certain",
-    "certaine",
-    "certains",
-    "certaines",
-    "ce",
-    "cet",
-    "cette",
-    "ces",
-    "est",
-    "sont",
-    "sera",
-    "seront",
-    "peut",
-    "peuvent",
-    "doit",
-    "doivent",
-    "faut",
-    "suppose",
-    "considere",
-    "considerent",
-    "arrive",
-    "arrivent",
-    "perd",
-    "perdent",
-    "envoie",
-    "envoient",
-    "renvoie",
-    "renvoient",
-    "limite",
-    "limitent",
-    "transmet",
-    "transmettent",
-    "recoit",
-    "reçoit",
-    "recoivent",
-    "reçoivent",
-    "declenche",
-    "déclenche",
-    "declenchent",
-    "déclenchent",
-    "active",
-    "activent",
-    "avec",
-    "sans",
-    "dans",
-    "pour",
-    "par",
-    "vers",
-    "entre",
-    "qu",
-    "quil",
-    "quils",
-    "vont",
-    "mettre",
-    "place",
-    "quelques",
-    "plusieurs",
-    "exemple",
-    "exemples",
-    "cas",
-    "maintenant",
-    "chose",
-    "choses",
-}
-MATCHING_GENERIC_SINGLE_LABEL_TOKENS: set[str] = {
-    "lettre",
-    "lettres",
-    "message",
-    "messages",
-    "donnee",
-    "donnees",
-    "donnée",
-    "données",
-    "information",
-    "informations",
-    "element",
-    "elements",
-    "élément",
-    "éléments",
-    "notion",
-    "notions",
-    "concept",
-    "concepts",
-    "paquet",
-    "paquets",
-}
-MATCHING_LEFT_FORBIDDEN_TOKENS: set[str] = {
-    "pas",
-    "si",
-    "meme",
-    "même",
-    "cela",
-    "ceci",
-    "ainsi",
-    "alors",
-    "debut",
-    "début",
-    "cote",
-    "côté",
-    "bout",
-    "temps",
-    "faut",
-    "font",
-    "fait",
-    "faire",
-    "vont",
-    "va",
-    "arrive",
-    "arriver",
-    "arrivent",
-    "mettre",
-    "met",
-    "mettent",
-    "quelques",
-    "plusieurs",
-    "exemple",
-    "exemples",
-    "cas",
-    "maintenant",
-}
+MATCHING_GENERIC_TOKEN_STOPWORDS: frozenset[str] = frozenset(
+    {
+        "le",
+        "la",
+        "les",
+        "un",
+        "une",
+        "des",
+        "du",
+        "de",
+        "d",
+        "l",
+        "au",
+        "aux",
+        "on",
+        "bien",
+        "entendu",
+        "ainsi",
+        "alors",
+        "donc",
+        "tout",
+        "tous",
+        "toute",
+        "toutes",
+        "chaque",
+        "certain",
+        "certaine",
+        "certains",
+        "certaines",
+        "ce",
+        "cet",
+        "cette",
+        "ces",
+        "est",
+        "sont",
+        "sera",
+        "seront",
+        "peut",
+        "peuvent",
+        "doit",
+        "doivent",
+        "faut",
+        "suppose",
+        "considere",
+        "considerent",
+        "arrive",
+        "arrivent",
+        "perd",
+        "perdent",
+        "envoie",
+        "envoient",
+        "renvoie",
+        "renvoient",
+        "limite",
+        "limitent",
+        "transmet",
+        "transmettent",
+        "recoit",
+        "recoivent",
+        "declenche",
+        "declenchent",
+        "active",
+        "activent",
+        "avec",
+        "sans",
+        "dans",
+        "pour",
+        "par",
+        "vers",
+        "entre",
+        "qu",
+        "quil",
+        "quils",
+        "vont",
+        "mettre",
+        "place",
+        "quelques",
+        "plusieurs",
+        "exemple",
+        "exemples",
+        "cas",
+        "maintenant",
+        "chose",
+        "choses",
+    }
+)
+MATCHING_GENERIC_SINGLE_LABEL_TOKENS: frozenset[str] = frozenset(
+    {
+        "lettre",
+        "lettres",
+        "message",
+        "messages",
+        "donnee",
+        "donnees",
+        "information",
+        "informations",
+        "element",
+        "elements",
+        "notion",
+        "notions",
+        "concept",
+        "concepts",
+        "paquet",
+        "paquets",
+    }
+)
+MATCHING_LEFT_FORBIDDEN_TOKENS: frozenset[str] = frozenset(
+    {
+        "pas",
+        "si",
+        "meme",
+        "cela",
+        "ceci",
+        "ainsi",
+        "alors",
+        "debut",
+        "cote",
+        "bout",
+        "temps",
+        "faut",
+        "font",
+        "fait",
+        "faire",
+        "vont",
+        "va",
+        "arrive",
+        "arriver",
+        "arrivent",
+        "mettre",
+        "met",
+        "mettent",
+        "quelques",
+        "plusieurs",
+        "exemple",
+        "exemples",
+        "cas",
+        "maintenant",
+    }
+)
+# Tokens never kept when deriving a matching label from a sentence.
+MATCHING_LABEL_SKIP_TOKENS: frozenset[str] = (
+    MATCHING_GENERIC_TOKEN_STOPWORDS | MATCHING_LEFT_FORBIDDEN_TOKENS | MATCHING_LABEL_BANNED_TOKENS
+)
 MATCHING_DEFINITION_CUE_PATTERN = re.compile(
     r"\b(est|sont|signifie|signifient|correspond|correspondent|definit|définit|definissent|définissent|"
     r"explique|expliquent|indique|indiquent|represente|représente|representent|représentent|"
@@ -346,7 +483,58 @@ MATCHING_DEFINITION_CUE_PATTERN = re.compile(
     r"permet|permettent|sert|servent|garantit|garantissent|c['’]?\s*est\s*[-–]?\s*[aà]\s*[-–]?\s*dire)\b",
     flags=re.IGNORECASE,
 )
+# Fused anchored rejections: one engine pass per side in _is_valid_matching_pair.
+MATCHING_LEFT_REJECT_PREFIX_PATTERN = re.compile(
+    "|".join(
+        f"(?:{pattern.pattern})"
+        for pattern in (
+            MATCHING_PLACEHOLDER_PATTERN,
+            MATCHING_BAD_LEFT_PREFIX_PATTERN,
+            MATCHING_LEFT_NOISY_PHRASE_PATTERN,
+        )
+    ),
+    flags=re.IGNORECASE,
+)
+MATCHING_RIGHT_REJECT_PREFIX_PATTERN = re.compile(
+    "|".join(
+        f"(?:{pattern.pattern})"
+        for pattern in (MATCHING_PLACEHOLDER_PATTERN, MATCHING_RIGHT_NOISY_START_PATTERN)
+    ),
+    flags=re.IGNORECASE,
+)
+# Static helpers for the matching-pair pipeline, compiled once instead of per call.
+SENTENCE_BREAK_PATTERN = re.compile(r"(?:[.!?]\s+|\n+)")
+MATCHING_WORD_TOKEN_PATTERN = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9'-]+")
+MATCHING_EDGE_NON_WORD_PATTERN = re.compile(r"^[\W_]+|[\W_]+$")
+MATCHING_ACRONYM_PATTERN = re.compile(r"[A-Z0-9]{2,10}")
+MATCHING_LEFT_QUANTIFIER_PREFIX_PATTERN = re.compile(
+    r"^\s*(?:toutes?\s+|tous\s+|chaque\s+|certaines?\s+|certains?\s+|ces\s+)",
+    flags=re.IGNORECASE,
+)
+# Split on French relative pronouns / punctuation — require word boundary
+# on BOTH sides to avoid matching inside words like "analogique", "numérique".
+MATCHING_LEFT_CLAUSE_SPLIT_PATTERN = re.compile(
+    r"\s*(?:,|;|qu[‘’]|\bqui\b|\bque\b|\bdont\b)\s*",
+    flags=re.IGNORECASE,
+)
+MATCHING_LEFT_TRAILING_CONNECTOR_PATTERN = re.compile(
+    r"\s+(?:de|du|des|d[‘’]?|pour|avec|sans|dans|sur|en|par|vers|et|ou)$",
+    flags=re.IGNORECASE,
+)
+MATCHING_RELATIVE_PRONOUN_PATTERN = re.compile(r"\b(?:qui|que|qu['’]|dont)\b", flags=re.IGNORECASE)
+MATCHING_SUIVANT_PREFIX_PATTERN = re.compile(r"^\s*est\s+le\s+suivant\s*,?\s*", flags=re.IGNORECASE)
+MATCHING_QUE_PREFIX_PATTERN = re.compile(r"^\s*que\s+", flags=re.IGNORECASE)
+MATCHING_SEMICOLON_PATTERN = re.compile(r"\s*;\s*")
+MATCHING_BLOB_SPLIT_PATTERN = re.compile(r"\s*(?:\|\||;;|;|\n)+\s*")
+MATCHING_PAIR_SEPARATOR_CHAR_PATTERN = re.compile(r"[-=→:]")
 MATCHING_RIGHT_MIN_WORDS = 3
+# Fixed association prompt, already in the _ensure_question_mark form.
+MATCHING_ASSOCIATION_PROMPT = "Associez chaque notion du texte a sa definition ou a sa caracteristique correspondante ?"
+DEFAULT_MATCHING_PAIRS: tuple[tuple[str, str], ...] = (
+    ("Concept principal", "Definition complete basee sur le texte source."),
+    ("Notion cle", "Lien explicite avec le contenu pedagogique fourni."),
+    ("Exemple concret", "Illustration precise qui aide a valider la comprehension."),
+)
 
 PronoteMode = Literal[
     "single_choice",
@@ -359,17 +547,8 @@ PronoteMode = Literal[
     "cloze_list_unique",
     "cloze_list_variable",
 ]
-PRONOTE_MODES: set[PronoteMode] = {
-    "single_choice",
-    "multiple_choice",
-    "numeric_value",
-    "free_response",
-    "spelling",
-    "association_pairs",
-    "cloze_free",
-    "cloze_list_unique",
-    "cloze_list_variable",
-}
+PRONOTE_MODES: frozenset[PronoteMode] = frozenset(get_args(PronoteMode))
+ITEM_DIFFICULTIES = frozenset({"easy", "medium", "hard"})
 
 
 class LLMOutputModel(BaseModel):
@@ -424,6 +603,132 @@ ITEM_TYPE_ALIASES: dict[str, ItemType] = {
     "structure_de_cours": ItemType.COURSE_STRUCTURE,
     "plan_de_cours": ItemType.COURSE_STRUCTURE,
 }
+# Aliases plus their plural spellings ("qcms", "associationss"...); exact aliases win.
+ITEM_TYPE_ALIASES_WITH_PLURALS: dict[str, ItemType] = {
+    **{f"{alias}s": item_type for alias, item_type in ITEM_TYPE_ALIASES.items()},
+    **ITEM_TYPE_ALIASES,
+}
+
+
+# Payload key aliases accepted for each GeneratedItem field, in priority order.
+ITEM_TYPE_PAYLOAD_KEYS: tuple[str, ...] = (
+    "item_type",
+    "type",
+    "question_type",
+    "content_type",
+    "kind",
+)
+ITEM_PROMPT_PAYLOAD_KEYS: tuple[str, ...] = (
+    "prompt",
+    "question",
+    "question_text",
+    "enonce",
+    "statement",
+    "text",
+    "title",
+)
+ITEM_ANSWER_PAYLOAD_KEYS: tuple[str, ...] = (
+    "correct_answer",
+    "answer",
+    "bonne_reponse",
+    "expected_answer",
+    "solution",
+)
+ITEM_DISTRACTORS_PAYLOAD_KEYS: tuple[str, ...] = (
+    "distractors",
+    "wrong_answers",
+    "incorrect_answers",
+    "false_answers",
+)
+ITEM_OPTIONS_PAYLOAD_KEYS: tuple[str, ...] = ("answer_options", "options", "choices", "responses")
+ITEM_DIFFICULTY_PAYLOAD_KEYS: tuple[str, ...] = ("difficulty", "level", "difficulte")
+ITEM_FEEDBACK_PAYLOAD_KEYS: tuple[str, ...] = ("feedback", "explanation", "commentaire")
+ITEM_SOURCE_PAYLOAD_KEYS: tuple[str, ...] = ("source_reference", "source", "reference", "section")
+
+
+# Prompt skeletons are dedented once at import; only the fields vary per call.
+_ITEMS_PROMPT_TEMPLATE = dedent(
+    """
+    Tu es un generateur de contenu pedagogique.
+    Regles strictes:
+    - Retourne UNIQUEMENT un JSON valide.
+    - N'ajoute AUCUN markdown, aucune balise, aucun texte hors JSON.
+    - Cle principale: items (liste), content_types (liste).
+    - Limite: {max_items} items max.
+    - Langue: {language}
+    - Niveau: {level}
+    - Matiere: {subject_value}
+    - Classe cible: {class_value}
+    - Difficulte cible: {difficulty_value}
+    - Types demandes: {types}
+    - Anti-hallucination: cite source_reference type 'section:X' quand possible.
+    - Pour les QCM: 1 bonne reponse + 3 distracteurs minimum.
+    - Pour les associations: format strict "Concept complet -> Definition complete" (pas de mots isoles).
+    - Formulation eleve: enonce clair, phrase courte (idealement <= 22 mots), une seule idee evaluee par question.
+    - Formulation eleve: evite les formulations floues ("idee principale de la section"), prefere des questions contextualisees et verifiables.
+    - Formulation eleve: vocabulaire simple, direct, adapte a la classe cible; evite les doubles negations et les ambiguities.
+    - Qualite pedagogique: distracteurs plausibles (erreurs frequentes d'eleves), jamais absurdes, jamais hors sujet.
+    - Qualite pedagogique: reponse attendue concise et exploitable par un enseignant (sauf numerique/association/texte a trous).
+    - Pour les textes a trous (cloze): chaque trou doit contenir le MOT REEL qui complete la phrase, JAMAIS de placeholder (mot2, mot3, Thematique, blank1, etc.). Les distracteurs de chaque trou doivent etre des mots plausibles mais incorrects dans ce contexte precis. Chaque trou = 1 seul mot ou expression courte du texte source.
+    - Pour les exercices d'epellation: les distracteurs doivent etre des fautes plausibles (accents manquants, lettres inversees), PAS des mots du prompt.
+    {lycee_wording_rule}
+    - Structure item:
+      {{
+        "item_type": "mcq|open_question|poll|cloze|matching|brainstorming|flashcard|course_structure",
+        "prompt": "question",
+        "correct_answer": "reponse attendue",
+        "distractors": ["...", "...", "..."],
+        "answer_options": ["..."],
+        "tags": ["..."],
+        "difficulty": "easy|medium|hard",
+        "feedback": "optionnel",
+        "source_reference": "section:1"
+      }}
+
+    Instructions supplementaires:
+    {extra}
+
+    Source normalisee:
+    {excerpt}
+    """
+)
+_MATCHING_PAIRS_PROMPT_TEMPLATE = dedent(
+    """
+    Tu es un expert pedagogique. Construis des paires d'association coherentes pour des eleves.
+    Retourne UNIQUEMENT un JSON valide de la forme:
+    {{
+      "pairs": [
+        {{"left": "Notion complete", "right": "Definition complete et pedagogique"}},
+        ...
+      ]
+    }}
+
+    Contraintes strictes:
+    - Produis exactement {target_size} paires, TOUTES DIFFERENTES entre elles.
+    - CHAQUE paire doit porter sur une notion DISTINCTE. Ne jamais reformuler la meme notion.
+    - left: notion disciplinaire complete (2 a 6 mots), sans verbe conjugue, sans fragment.
+    - right: phrase complete de definition (10 a 24 mots), explicite, sans texte tronque.
+    - right: NE COMMENCE JAMAIS par "est", "sont", "c'est" ou un verbe d'etat. Ecris directement une definition sous forme de groupe nominal ou phrase autonome.
+      Exemple correct: "Transfert d'energie thermique par contact direct entre deux corps."
+      Exemple incorrect: "Est un transfert d'energie thermique par contact."
+    - TOUS les mots doivent etre COMPLETS. Jamais de mot coupe ou tronque. Jamais de lettre manquante.
+    - Les accents doivent etre corrects : é, è, ê, à, ù, ç, etc.
+    - right: la definition NE DOIT PAS contenir le terme exact de left ni un mot qui donne directement la reponse. L'eleve doit reflechir pour trouver l'association.
+      Exemple correct: left="Signal sinusoidal", right="Forme d'onde periodique decrite par une fonction trigonometrique lisse"
+      Exemple incorrect: left="Signal sinusoidal", right="Signal periodique dont la forme est sinusoidale"
+    - Interdit dans left: mots de liaison, adverbes temporels, formulations narratives.
+    - Evite les parentheses avec des symboles ou abreviations dans left et right.
+    - Utilise les notions fondamentales presentes dans la source.
+    - Verifie que chaque paire est unique et non redondante avant de la produire.
+    - Langue: {language}
+    - Niveau: {level}
+    - Classe: {class_value}
+    - Matiere: {subject_value}
+
+    Source:
+    {excerpt}
+    """
+)
 
 
 def build_prompt(
@@ -445,68 +750,25 @@ def build_prompt(
     subject_value = subject.strip() if subject else "non precisee"
     class_value = class_level.strip() if class_level else level
     difficulty_value = difficulty_target.strip() if difficulty_target else "medium"
-    class_value_normalized = class_value.lower()
-    lycee_keywords = (
-        "lycee",
-        "2de",
-        "seconde",
-        "1ere",
-        "premiere",
-        "terminale",
-        "bac",
-    )
     lycee_wording_rule = (
         "- Niveau lycee: vocabulaire B1-B2, exemples concrets proches du quotidien scolaire, pas de jargon inutile."
-        if any(keyword in class_value_normalized for keyword in lycee_keywords)
+        if LYCEE_CLASS_PATTERN.search(class_value.lower())
         else ""
     )
     cleaned_source = _sanitize_source_for_generation(source_text)
     excerpt = cleaned_source[:14000] if cleaned_source else source_text[:14000]
 
-    return dedent(
-        f"""
-        Tu es un generateur de contenu pedagogique.
-        Regles strictes:
-        - Retourne UNIQUEMENT un JSON valide.
-        - N'ajoute AUCUN markdown, aucune balise, aucun texte hors JSON.
-        - Cle principale: items (liste), content_types (liste).
-        - Limite: {max_items} items max.
-        - Langue: {language}
-        - Niveau: {level}
-        - Matiere: {subject_value}
-        - Classe cible: {class_value}
-        - Difficulte cible: {difficulty_value}
-        - Types demandes: {types}
-        - Anti-hallucination: cite source_reference type 'section:X' quand possible.
-        - Pour les QCM: 1 bonne reponse + 3 distracteurs minimum.
-        - Pour les associations: format strict "Concept complet -> Definition complete" (pas de mots isoles).
-        - Formulation eleve: enonce clair, phrase courte (idealement <= 22 mots), une seule idee evaluee par question.
-        - Formulation eleve: evite les formulations floues ("idee principale de la section"), prefere des questions contextualisees et verifiables.
-        - Formulation eleve: vocabulaire simple, direct, adapte a la classe cible; evite les doubles negations et les ambiguities.
-        - Qualite pedagogique: distracteurs plausibles (erreurs frequentes d'eleves), jamais absurdes, jamais hors sujet.
-        - Qualite pedagogique: reponse attendue concise et exploitable par un enseignant (sauf numerique/association/texte a trous).
-        - Pour les textes a trous (cloze): chaque trou doit contenir le MOT REEL qui complete la phrase, JAMAIS de placeholder (mot2, mot3, Thematique, blank1, etc.). Les distracteurs de chaque trou doivent etre des mots plausibles mais incorrects dans ce contexte precis. Chaque trou = 1 seul mot ou expression courte du texte source.
-        - Pour les exercices d'epellation: les distracteurs doivent etre des fautes plausibles (accents manquants, lettres inversees), PAS des mots du prompt.
-        {lycee_wording_rule}
-        - Structure item:
-          {{
-            "item_type": "mcq|open_question|poll|cloze|matching|brainstorming|flashcard|course_structure",
-            "prompt": "question",
-            "correct_answer": "reponse attendue",
-            "distractors": ["...", "...", "..."],
-            "answer_options": ["..."],
-            "tags": ["..."],
-            "difficulty": "easy|medium|hard",
-            "feedback": "optionnel",
-            "source_reference": "section:1"
-          }}
-
-        Instructions supplementaires:
-        {extra}
-
-        Source normalisee:
-        {excerpt}
-        """
+    return _ITEMS_PROMPT_TEMPLATE.format(
+        max_items=max_items,
+        language=language,
+        level=level,
+        subject_value=subject_value,
+        class_value=class_value,
+        difficulty_value=difficulty_value,
+        types=types,
+        lycee_wording_rule=lycee_wording_rule,
+        extra=extra,
+        excerpt=excerpt,
     ).strip()
 
 
@@ -522,45 +784,16 @@ def generate_items(
     subject: str | None = None,
     class_level: str | None = None,
     difficulty_target: str | None = None,
+    concurrent_matching_pool: bool = False,
 ) -> list[GeneratedItem]:
-    """Generate and validate pedagogical items."""
+    """Generate and validate pedagogical items.
 
-    effective_source = _sanitize_source_for_generation(source_text) or source_text
-    prompt = build_prompt(
-        source_text=effective_source,
-        content_types=content_types,
-        instructions=instructions,
-        max_items=max_items,
-        language=language,
-        level=level,
-        subject=subject,
-        class_level=class_level,
-        difficulty_target=difficulty_target,
-    )
-
-    llm_items = _attempt_llm_generation(
-        provider=provider,
-        prompt=prompt,
-        content_types=content_types,
-    )
-    if not llm_items:
-        retry_prompt = (
-            prompt
-            + "\n\nIMPORTANT: reponds strictement en JSON avec la cle racine 'items' "
-            + "et une liste de questions pedagogiques concretes basees sur la source."
-        )
-        llm_items = _attempt_llm_generation(
-            provider=provider,
-            prompt=retry_prompt,
-            content_types=content_types,
-        )
+    With ``concurrent_matching_pool``, the association pairs LLM pass is issued
+    alongside the main generation call instead of after it; it only depends on
+    the requested types and instructions, so the two round-trips can overlap.
+    """
 
-    validated = _ensure_item_count(
-        items=llm_items,
-        source_text=effective_source,
-        content_types=content_types,
-        max_items=max_items,
-    )
+    effective_source = _sanitize_source_for_generation(source_text) or source_text
     pronote_mode_sequence = _extract_pronote_mode_sequence(
         instructions=instructions,
         max_items=max_items,
@@ -570,7 +803,7 @@ def generate_items(
         ContentType.MATCHING in content_types
         or any(mode == "association_pairs" for mode in pronote_mode_sequence)
     )
-    llm_matching_pool: list[tuple[str, str]] = []
+    matching_pool_kwargs: dict[str, Any] | None = None
     if should_refine_association_pairs:
         matching_count = sum(1 for mode in pronote_mode_sequence if mode == "association_pairs")
         association_target = max(
@@ -578,15 +811,68 @@ def generate_items(
             matching_count * (pairs_per_question + 2),
             max_items * 2,
         )
-        llm_matching_pool = _build_matching_llm_pairs_pool(
-            provider=provider,
+        matching_pool_kwargs = {
+            "provider": provider,
+            "source_text": effective_source,
+            "desired_pairs": association_target,
+            "language": language,
+            "level": level,
+            "subject": subject,
+            "class_level": class_level,
+        }
+    matching_pool_future: Future[list[tuple[str, str]]] | None = None
+    if matching_pool_kwargs is not None and concurrent_matching_pool:
+        matching_pool_future = _get_llm_executor().submit(
+            _build_matching_llm_pairs_pool, **matching_pool_kwargs
+        )
+
+    # The pool request is already in flight: cancel it if the primary pass
+    # fails, rather than leaving it running on the shared executor.
+    try:
+        prompt = build_prompt(
             source_text=effective_source,
-            desired_pairs=association_target,
+            content_types=content_types,
+            instructions=instructions,
+            max_items=max_items,
             language=language,
             level=level,
             subject=subject,
             class_level=class_level,
+            difficulty_target=difficulty_target,
         )
+
+        llm_items = _attempt_llm_generation(
+            provider=provider,
+            prompt=prompt,
+            content_types=content_types,
+        )
+        if not llm_items:
+            retry_prompt = (
+                prompt
+                + "\n\nIMPORTANT: reponds strictement en JSON avec la cle racine 'items' "
+                + "et une liste de questions pedagogiques concretes basees sur la source."
+            )
+            llm_items = _attempt_llm_generation(
+                provider=provider,
+                prompt=retry_prompt,
+                content_types=content_types,
+            )
+
+        validated = _ensure_item_count(
+            items=llm_items,
+            source_text=effective_source,
+            content_types=content_types,
+            max_items=max_items,
+        )
+    except BaseException:
+        if matching_pool_future is not None:
+            matching_pool_future.cancel()
+        raise
+    llm_matching_pool: list[tuple[str, str]] = []
+    if matching_pool_future is not None:
+        llm_matching_pool = matching_pool_future.result()
+    elif matching_pool_kwargs is not None:
+        llm_matching_pool = _build_matching_llm_pairs_pool(**matching_pool_kwargs)
     if pronote_mode_sequence:
         validated = _enforce_pronote_mode_coherence(
             items=validated,
@@ -625,6 +911,18 @@ def generate_items(
     return [_sanitize_generated_item(item) for item in validated[:max_items]]
 
 
+def _get_llm_executor() -> ThreadPoolExecutor:
+    """Return the shared executor used to overlap independent LLM calls."""
+
+    global _LLM_EXECUTOR
+    with _LLM_EXECUTOR_LOCK:
+        if _LLM_EXECUTOR is None:
+            _LLM_EXECUTOR = ThreadPoolExecutor(
+                max_workers=LLM_EXECUTOR_MAX_WORKERS, thread_name_prefix="llm-matching-pool"
+            )
+        return _LLM_EXECUTOR
+
+
 # ────────────────────────────────────────────────
 #  Multi-pass LLM: Cloze repair
 # ────────────────────────────────────────────────
@@ -638,6 +936,12 @@ _CLOZE_JUNK_CORRECT_PATTERN = re.compile(
 
 # Pattern for extracting all %100% values from inline cloze tokens
 _CLOZE_INLINE_CORRECT_PATTERN = re.compile(r"%100%([^#}]+)")
+_CLOZE_PLACEHOLDER_VALUE_PATTERN = re.compile(
+    r"^(?:mot|word|var|blank|item|option)\s*\d+$", flags=re.IGNORECASE
+)
+_CLOZE_ASSOCIATION_PROMPT_PATTERN = re.compile(r"^\s*Associez\b", flags=re.IGNORECASE)
+_CLOZE_MULTICHOICE_FIELD_PATTERN = re.compile(r"\{:MULTICHOICE:[^}]+\}")
+_CLOZE_WORD_BANK_PATTERN = re.compile(r"\[([^\]\[]{4,300})\]")
 
 
 def _cloze_item_needs_llm_repair(item: GeneratedItem) -> bool:
@@ -663,14 +967,14 @@ def _cloze_item_needs_llm_repair(item: GeneratedItem) -> bool:
         if len(value) <= 3 and " " not in value:
             return True
         # Placeholder variables: mot2, word1, blank3, etc.
-        if re.match(r"^(?:mot|word|var|blank|item|option)\s*\d+$", value, flags=re.IGNORECASE):
+        if _CLOZE_PLACEHOLDER_VALUE_PATTERN.match(value):
             return True
         # Known instruction words
         if _CLOZE_JUNK_CORRECT_PATTERN.match(value):
             return True
 
     # ── Also flag items whose prompt starts with "Associez" (broken matching) ──
-    if re.match(r"^\s*Associez\b", prompt, flags=re.IGNORECASE):
+    if _CLOZE_ASSOCIATION_PROMPT_PATTERN.match(prompt):
         return True
 
     return False
@@ -693,11 +997,9 @@ def _repair_cloze_items_via_llm(
     descriptions: list[str] = []
     for idx in repair_indexes:
         raw_prompt = items[idx].prompt or ""
-        clean_prompt = re.sub(
-            r"\{:MULTICHOICE:[^}]+\}", "____", raw_prompt
-        )
+        clean_prompt = _CLOZE_MULTICHOICE_FIELD_PATTERN.sub("____", raw_prompt)
         # Extract the word bank if present (e.g. "[protocoles, commutateur, ...]")
-        word_bank_match = re.search(r"\[([^\]\[]{4,300})\]", raw_prompt)
+        word_bank_match = _CLOZE_WORD_BANK_PATTERN.search(raw_prompt)
         if word_bank_match:
             clean_prompt += f"\n  MOTS ATTENDUS: {word_bank_match.group(1)}"
         descriptions.append(f"Question {idx + 1}: {clean_prompt}")
@@ -837,10 +1139,10 @@ def _validate_mcq_items_via_llm(
 def _parse_json_list(raw: str, *, key: str) -> list[dict]:
     """Extract a list of dicts from a JSON block keyed by *key*."""
     try:
-        json_match = re.search(r"\{[\s\S]*\}", raw)
+        json_match = JSON_OBJECT_SPAN_PATTERN.search(raw)
         if not json_match:
             return []
-        data = json.loads(json_match.group())
+        data = _load_llm_json(json_match.group())
         entries = data.get(key, [])
         return [e for e in entries if isinstance(e, dict)] if isinstance(entries, list) else []
     except (json.JSONDecodeError, ValueError, TypeError):
@@ -863,25 +1165,40 @@ def _attempt_llm_generation(
     )
 
 
+def _load_llm_json(text: str) -> Any:
+    """Decode LLM JSON, using orjson when installed and stdlib json otherwise.
+
+    Anything orjson rejects (NaN, >64-bit integers, lone surrogates) is retried
+    with json.loads so accepted payloads and raised errors match the stdlib.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
 def _extract_json_block(raw: str) -> str:
     """Extract JSON object/array from provider response."""
 
     if not raw.strip():
         return raw
 
-    fenced_match = re.search(
-        r"```(?:json)?\s*([\[{].*?[\]}])\s*```", raw, flags=re.DOTALL | re.IGNORECASE
-    )
-    if fenced_match:
-        return fenced_match.group(1).strip()
+    fence_start = raw.find("```")
+    if fence_start >= 0:
+        fenced_match = FENCED_JSON_BLOCK_PATTERN.search(raw, fence_start)
+        if fenced_match:
+            return fenced_match.group(1).strip()
 
+    # Earliest opener: the "[" scan is bounded by the first "{" when there is one.
     object_start = raw.find("{")
-    array_start = raw.find("[")
-    starts = [position for position in (object_start, array_start) if position >= 0]
-    if not starts:
+    array_start = raw.find("[", 0, object_start) if object_start >= 0 else raw.find("[")
+    start = array_start if array_start >= 0 else object_start
+    if start < 0:
         return raw
 
-    start = min(starts)
     opener = raw[start]
     closer = "}" if opener == "{" else "]"
     end = raw.rfind(closer)
@@ -894,7 +1211,7 @@ def _parse_llm_output(raw: str) -> LLMOutputModel:
     """Parse LLM response into a tolerant intermediate payload."""
 
     try:
-        payload = json.loads(_extract_json_block(raw))
+        payload = _load_llm_json(_extract_json_block(raw))
     except json.JSONDecodeError:
         return LLMOutputModel(items=[])
 
@@ -927,10 +1244,13 @@ def _parse_llm_output(raw: str) -> LLMOutputModel:
     if not isinstance(content_types, list):
         content_types = []
 
-    try:
-        return LLMOutputModel.model_validate({"items": items, "content_types": content_types})
-    except ValidationError:
+    # Same outcome as model_validate (all-or-nothing), without pydantic's
+    # per-element coercion: decoded JSON objects already have str keys.
+    if not all(isinstance(item, dict) for item in items) or not all(
+        isinstance(content_type, str) for content_type in content_types
+    ):
         return LLMOutputModel(items=[])
+    return LLMOutputModel.model_construct(items=items, content_types=content_types)
 
 
 def _build_matching_llm_pairs_pool(
@@ -957,56 +1277,43 @@ def _build_matching_llm_pairs_pool(
     target_size = max(2, min(48, desired_pairs))
     excerpt = prepared_source[:14000]
 
-    prompt = dedent(
-        f"""
-        Tu es un expert pedagogique. Construis des paires d'association coherentes pour des eleves.
-        Retourne UNIQUEMENT un JSON valide de la forme:
-        {{
-          "pairs": [
-            {{"left": "Notion complete", "right": "Definition complete et pedagogique"}},
-            ...
-          ]
-        }}
-
-        Contraintes strictes:
-        - Produis exactement {target_size} paires, TOUTES DIFFERENTES entre elles.
-        - CHAQUE paire doit porter sur une notion DISTINCTE. Ne jamais reformuler la meme notion.
-        - left: notion disciplinaire complete (2 a 6 mots), sans verbe conjugue, sans fragment.
-        - right: phrase complete de definition (10 a 24 mots), explicite, sans texte tronque.
-        - right: NE COMMENCE JAMAIS par "est", "sont", "c'est" ou un verbe d'etat. Ecris directement une definition sous forme de groupe nominal ou phrase autonome.
-          Exemple correct: "Transfert d'energie thermique par contact direct entre deux corps."
-          Exemple incorrect: "Est un transfert d'energie thermique par contact."
-        - TOUS les mots doivent etre COMPLETS. Jamais de mot coupe ou tronque. Jamais de lettre manquante.
-        - Les accents doivent etre corrects : é, è, ê, à, ù, ç, etc.
-        - right: la definition NE DOIT PAS contenir le terme exact de left ni un mot qui donne directement la reponse. L'eleve doit reflechir pour trouver l'association.
-          Exemple correct: left="Signal sinusoidal", right="Forme d'onde periodique decrite par une fonction trigonometrique lisse"
-          Exemple incorrect: left="Signal sinusoidal", right="Signal periodique dont la forme est sinusoidale"
-        - Interdit dans left: mots de liaison, adverbes temporels, formulations narratives.
-        - Evite les parentheses avec des symboles ou abreviations dans left et right.
-        - Utilise les notions fondamentales presentes dans la source.
-        - Verifie que chaque paire est unique et non redondante avant de la produire.
-        - Langue: {language}
-        - Niveau: {level}
-        - Classe: {class_value}
-        - Matiere: {subject_value}
-
-        Source:
-        {excerpt}
-        """
-    ).strip()
+    def render_prompt(pair_count: int) -> str:
+        return _MATCHING_PAIRS_PROMPT_TEMPLATE.format(
+            target_size=pair_count,
+            language=language,
+            level=level,
+            class_value=class_value,
+            subject_value=subject_value,
+            excerpt=excerpt,
+        ).strip()
 
-    pairs = _extract_matching_pairs_from_llm_payload(provider.generate(prompt), limit=target_size)
+    pairs = _extract_matching_pairs_from_llm_payload(
+        provider.generate(render_prompt(target_size)), limit=target_size
+    )
     if len(pairs) >= max(2, min(4, target_size)):
         return pairs
 
+    # Only ask for the missing pairs, and keep the ones already validated.
+    shortfall = target_size - len(pairs)
     retry_prompt = (
-        prompt
+        render_prompt(shortfall)
         + "\nIMPORTANT: ne fournis que des notions disciplinaires concretes et des definitions completes. "
         + "Aucun mot isole, aucune phrase incomplete."
         + "\nNe commence AUCUNE definition par 'est' ou 'sont'. Chaque definition doit etre un groupe nominal autonome."
     )
-    retry_pairs = _extract_matching_pairs_from_llm_payload(provider.generate(retry_prompt), limit=target_size)
-    return retry_pairs if len(retry_pairs) > len(pairs) else pairs
+    if pairs:
+        retry_prompt += "\nNotions deja retenues (ne pas les reprendre): " + "; ".join(
+            left for left, _ in pairs
+        )
+    retry_pairs = _extract_matching_pairs_from_llm_payload(provider.generate(retry_prompt), limit=shortfall)
+
+    # Re-select over the merged pool so a retry cannot reintroduce a notion or
+    # a definition the first attempt already covers.
+    merged = [
+        (index, left, right, _matching_pair_quality_score(left, right))
+        for index, (left, right) in enumerate([*pairs, *retry_pairs], start=1)
+    ]
+    return _select_best_matching_pairs(merged, limit=target_size)
 
 
 def _extract_matching_pairs_from_llm_payload(raw: str, *, limit: int) -> list[tuple[str, str]]:
@@ -1016,7 +1323,7 @@ def _extract_matching_pairs_from_llm_payload(raw: str, *, limit: int) -> list[tu
         return []
 
     try:
-        payload = json.loads(_extract_json_block(raw))
+        payload = _load_llm_json(_extract_json_block(raw))
     except json.JSONDecodeError:
         return []
 
@@ -1034,15 +1341,11 @@ def _extract_matching_pairs_from_llm_payload(raw: str, *, limit: int) -> list[tu
             if isinstance(row, Mapping):
                 candidate_pairs.append(dict(row))
 
-    try:
-        parsed = LLMMatchingPairsModel.model_validate({"pairs": candidate_pairs})
-    except ValidationError:
-        return []
-
-    scored: list[tuple[int, str, str, int]] = []
-    seen: set[tuple[str, str]] = set()
-    sequence = 0
-    for row in parsed.pairs:
+    # Rows are decoded JSON objects (str keys), so they already satisfy the
+    # LLMMatchingPairsModel shape; no pydantic round-trip is needed.
+    # Keyed by the lowercased pair: one dict both dedupes and keeps source order.
+    scored: dict[tuple[str, str], tuple[int, str, str, int]] = {}
+    for row in candidate_pairs:
         left_raw = ""
         right_raw = ""
         for key in ("left", "concept", "notion", "term", "element", "label"):
@@ -1066,6 +1369,9 @@ def _extract_matching_pairs_from_llm_payload(raw: str, *, limit: int) -> list[tu
         if not left:
             continue
         left = _normalize_matching_left_display(left)
+        # A label _is_valid_matching_pair would reject needs no definition clean-up.
+        if not _is_valid_matching_left(" ".join(left.split()).strip(" -:;,.")):
+            continue
         right = _coerce_matching_definition(left, right_raw)
         if not right:
             continue
@@ -1073,13 +1379,11 @@ def _extract_matching_pairs_from_llm_payload(raw: str, *, limit: int) -> list[tu
             continue
 
         key = (left.lower(), right.lower())
-        if key in seen:
+        if key in scored:
             continue
-        seen.add(key)
-        sequence += 1
-        scored.append((sequence, left, right, _matching_pair_quality_score(left, right)))
+        scored[key] = (len(scored) + 1, left, right, _matching_pair_quality_score(left, right))
 
-    return _select_best_matching_pairs(scored, limit=max(2, limit))
+    return _select_best_matching_pairs(scored.values(), limit=max(2, limit))
 
 
 def _coerce_generated_items(
@@ -1103,10 +1407,8 @@ def _coerce_generated_items(
         )
         if normalized is None:
             continue
-        try:
-            generated_items.append(GeneratedItem.model_validate(normalized))
-        except ValidationError:
-            continue
+        # Fields are already schema-valid, so skip pydantic re-validation.
+        generated_items.append(GeneratedItem.model_construct(**normalized))
     return generated_items
 
 
@@ -1116,48 +1418,33 @@ def _normalize_item_payload(
     default_item_type: ItemType,
     position: int,
 ) -> dict[str, Any] | None:
-    """Map heterogeneous LLM item shapes to GeneratedItem schema."""
+    """Map heterogeneous LLM item shapes to GeneratedItem schema.
 
-    item_type = _parse_item_type(
-        _pick_first_key(raw_item, ("item_type", "type", "question_type", "content_type", "kind")),
-        default_item_type=default_item_type,
-    )
-    prompt = _coerce_text(
-        _pick_first_key(
-            raw_item,
-            ("prompt", "question", "question_text", "enonce", "statement", "text", "title"),
-        )
-    )
+    Every returned value already has its GeneratedItem field type, so the
+    payload can be passed straight to ``GeneratedItem.model_construct``.
+    """
+
+    normalized_payload: dict[str, Any] = {}
+
+    def pick(keys: tuple[str, ...]) -> Any:
+        return _pick_first_key(raw_item, keys, normalized_payload=normalized_payload)
+
+    item_type = _parse_item_type(pick(ITEM_TYPE_PAYLOAD_KEYS), default_item_type=default_item_type)
+    prompt = _coerce_text(pick(ITEM_PROMPT_PAYLOAD_KEYS))
     if not prompt:
         return None
 
-    correct_answer = _coerce_text(
-        _pick_first_key(
-            raw_item,
-            ("correct_answer", "answer", "bonne_reponse", "expected_answer", "solution"),
-        )
-    )
-    distractors = _coerce_string_list(
-        _pick_first_key(
-            raw_item,
-            ("distractors", "wrong_answers", "incorrect_answers", "false_answers"),
-        )
-    )
-    answer_options = _coerce_string_list(
-        _pick_first_key(raw_item, ("answer_options", "options", "choices", "responses"))
-    )
+    correct_answer = _coerce_text(pick(ITEM_ANSWER_PAYLOAD_KEYS))
+    distractors = _coerce_string_list(pick(ITEM_DISTRACTORS_PAYLOAD_KEYS))
+    answer_options = _coerce_string_list(pick(ITEM_OPTIONS_PAYLOAD_KEYS))
     tags = _coerce_string_list(raw_item.get("tags")) or [item_type.value]
 
-    difficulty = (
-        _coerce_text(_pick_first_key(raw_item, ("difficulty", "level", "difficulte"))) or "medium"
-    ).lower()
-    if difficulty not in {"easy", "medium", "hard"}:
+    difficulty = (_coerce_text(pick(ITEM_DIFFICULTY_PAYLOAD_KEYS)) or "medium").lower()
+    if difficulty not in ITEM_DIFFICULTIES:
         difficulty = "medium"
 
-    feedback = _coerce_text(_pick_first_key(raw_item, ("feedback", "explanation", "commentaire")))
-    source_reference = _coerce_text(
-        _pick_first_key(raw_item, ("source_reference", "source", "reference", "section"))
-    )
+    feedback = _coerce_text(pick(ITEM_FEEDBACK_PAYLOAD_KEYS))
+    source_reference = _coerce_text(pick(ITEM_SOURCE_PAYLOAD_KEYS))
     if source_reference and source_reference.isdigit():
         source_reference = f"section:{source_reference}"
     if not source_reference:
@@ -1168,27 +1455,26 @@ def _normalize_item_payload(
             correct_answer = answer_options[0]
         if answer_options and not distractors:
             distractors = [option for option in answer_options if option != correct_answer]
-        distractors = _dedupe_strings(distractors)
         if len(distractors) < 3:
-            distractors.extend(_default_mcq_distractors(existing=distractors))
-        distractors = distractors[:3]
+            distractors = [*distractors, *_default_mcq_distractors(existing=distractors)]
+        distractors = _dedupe_strings(distractors[:3])
         answer_options = []
 
     if item_type == ItemType.POLL:
-        poll_options = _dedupe_strings(answer_options or distractors)
         # No longer pad with "Option A/B/C" placeholders — empty polls
         # will be skipped at export time rather than emitted with junk.
-        answer_options = poll_options[:6]
+        answer_options = (answer_options or distractors)[:6]
         correct_answer = None
         distractors = []
 
+    # Lists from _coerce_string_list are already stripped and deduplicated.
     return {
-        "item_type": item_type.value,
+        "item_type": item_type,
         "prompt": prompt,
         "correct_answer": correct_answer,
-        "distractors": _dedupe_strings(distractors),
-        "answer_options": _dedupe_strings(answer_options),
-        "tags": _dedupe_strings(tags),
+        "distractors": distractors,
+        "answer_options": answer_options,
+        "tags": tags,
         "difficulty": difficulty,
         "feedback": feedback,
         "source_reference": source_reference,
@@ -1204,42 +1490,56 @@ def _parse_item_type(raw_value: Any, *, default_item_type: ItemType) -> ItemType
     if isinstance(raw_value, ContentType):
         return CONTENT_TYPE_TO_ITEM_TYPE.get(raw_value, default_item_type)
 
-    normalized = _normalize_identifier(_coerce_text(raw_value) or "")
-    if not normalized:
-        return default_item_type
-    if normalized in ITEM_TYPE_ALIASES:
-        return ITEM_TYPE_ALIASES[normalized]
-    if normalized.endswith("s") and normalized[:-1] in ITEM_TYPE_ALIASES:
-        return ITEM_TYPE_ALIASES[normalized[:-1]]
+    # Alias keys are canonical identifiers: an exact hit needs no normalization.
+    if isinstance(raw_value, str) and raw_value in ITEM_TYPE_ALIASES_WITH_PLURALS:
+        return ITEM_TYPE_ALIASES_WITH_PLURALS[raw_value]
 
-    return default_item_type
+    resolved = _resolve_item_type_alias(_coerce_text(raw_value) or "")
+    return resolved if resolved is not None else default_item_type
 
 
-def _pick_first_key(payload: Mapping[str, Any], keys: tuple[str, ...]) -> Any:
-    """Read first available value from key aliases in a mapping payload."""
+@lru_cache(maxsize=256)
+def _resolve_item_type_alias(value: str) -> ItemType | None:
+    return ITEM_TYPE_ALIASES_WITH_PLURALS.get(_normalize_identifier(value))
+
+
+def _pick_first_key(
+    payload: Mapping[str, Any],
+    keys: tuple[str, ...],
+    *,
+    normalized_payload: dict[str, Any] | None = None,
+) -> Any:
+    """Read first available value from key aliases in a mapping payload.
+
+    Aliases must already be canonical identifiers (``_normalize_identifier``
+    leaves them unchanged), so they double as normalized lookup keys.
+    Callers reading several aliases from one payload can pass the same
+    ``normalized_payload`` dict; it is filled on the first miss and reused.
+    """
 
     for key in keys:
         if key in payload:
             return payload[key]
 
-    normalized_map: dict[str, Any] = {}
-    for key, value in payload.items():
-        if isinstance(key, str):
-            normalized_map[_normalize_identifier(key)] = value
+    if normalized_payload is None:
+        normalized_payload = {}
+    if not normalized_payload:
+        for key, value in payload.items():
+            if isinstance(key, str):
+                normalized_payload[_normalize_identifier(key)] = value
 
     for key in keys:
-        normalized = _normalize_identifier(key)
-        if normalized in normalized_map:
-            return normalized_map[normalized]
+        if key in normalized_payload:
+            return normalized_payload[key]
     return None
 
 
 def _coerce_text(raw_value: Any) -> str | None:
+    # Most LLM values are plain strings: test that before anything else.
+    if isinstance(raw_value, str):
+        return raw_value.strip() or None
     if raw_value is None:
         return None
-    if isinstance(raw_value, str):
-        cleaned = raw_value.strip()
-        return cleaned or None
     if isinstance(raw_value, (int, float)):
         return str(raw_value)
     if isinstance(raw_value, Mapping):
@@ -1254,16 +1554,17 @@ def _coerce_string_list(raw_value: Any) -> list[str]:
     if raw_value is None:
         return []
     if isinstance(raw_value, str):
-        if not raw_value.strip():
-            return []
-        parts = re.split(r"[;\n|]+", raw_value)
-        return _dedupe_strings([part.strip() for part in parts if part.strip()])
+        return _dedupe_strings(LIST_SEPARATOR_PATTERN.split(raw_value))
     if isinstance(raw_value, Mapping):
         text_candidate = _coerce_text(raw_value)
         return [text_candidate] if text_candidate else []
     if isinstance(raw_value, list):
+        # _dedupe_strings strips and drops blanks, so string entries pass through as-is.
         values: list[str] = []
         for entry in raw_value:
+            if isinstance(entry, str):
+                values.append(entry)
+                continue
             text_candidate = _coerce_text(entry)
             if text_candidate:
                 values.append(text_candidate)
@@ -1274,6 +1575,8 @@ def _coerce_string_list(raw_value: Any) -> list[str]:
 def _dedupe_strings(values: list[str]) -> list[str]:
     seen: set[str] = set()
     deduped: list[str] = []
+    add_seen = seen.add
+    append = deduped.append
     for value in values:
         cleaned = value.strip()
         if not cleaned:
@@ -1281,8 +1584,8 @@ def _dedupe_strings(values: list[str]) -> list[str]:
         lowered = cleaned.lower()
         if lowered in seen:
             continue
-        seen.add(lowered)
-        deduped.append(cleaned)
+        add_seen(lowered)
+        append(cleaned)
     return deduped
 
 
@@ -1297,13 +1600,23 @@ def _default_mcq_distractors(*, existing: list[str]) -> list[str]:  # noqa: ARG0
     return []
 
 
+def _fold_ascii(value: str) -> str:
+    """NFKD-decompose and drop non-ASCII, via one translate pass for Latin text."""
+
+    if value.isascii():
+        return value
+    folded = value.translate(ASCII_FOLD_TABLE)
+    if folded.isascii():
+        return folded
+    return unicodedata.normalize("NFKD", folded).encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=8192)
 def _normalize_identifier(value: str) -> str:
-    normalized = unicodedata.normalize("NFKD", value.strip().lower())
-    normalized = normalized.encode("ascii", "ignore").decode("ascii")
-    normalized = normalized.replace("-", "_").replace(" ", "_")
-    normalized = re.sub(r"[^a-z0-9_]+", "_", normalized)
-    normalized = re.sub(r"_+", "_", normalized).strip("_")
-    return normalized
+    normalized = _fold_ascii(value.strip().lower()).translate(IDENTIFIER_CHAR_TABLE)
+    if "__" in normalized:
+        normalized = IDENTIFIER_UNDERSCORE_RUN_PATTERN.sub("_", normalized)
+    return normalized.strip("_")
 
 
 def _ensure_item_count(
@@ -1329,15 +1642,17 @@ def _ensure_item_count(
         return fallback_items[:max_items]
 
     merged = list(items)
+    merged_prompts = {existing.prompt for existing in merged}
     index = 0
     while len(merged) < max_items:
         template_item = fallback_items[index % len(fallback_items)]
         candidate = template_item
-        if any(existing.prompt == template_item.prompt for existing in merged):
+        if template_item.prompt in merged_prompts:
             candidate = template_item.model_copy(
                 update={"prompt": f"{template_item.prompt} (variante {len(merged) + 1})"}
             )
         merged.append(candidate)
+        merged_prompts.add(candidate.prompt)
         index += 1
 
     return merged
@@ -1354,16 +1669,21 @@ def _rule_based_fallback(
         sentences = ["Le document presente des notions importantes."]
 
     types_cycle = content_types or [ContentType.MCQ]
+    # Matching pairs only depend on the source: build them once, on first use.
+    matching_pairs: list[tuple[str, str]] | None = None
     items: list[GeneratedItem] = []
     for index in range(max_items):
         number = index + 1
         content_type = types_cycle[index % len(types_cycle)]
-        sentence = sentences[index % len(sentences)]
+        sentence_index = index % len(sentences)
+        sentence = sentences[sentence_index]
+        source_reference = f"section:{sentence_index + 1}"
+        # The first three sentences other than the current one; only four can qualify.
+        other_sentences = [s for j, s in enumerate(sentences[:4]) if j != sentence_index][:3]
 
         if content_type == ContentType.MCQ:
             # Build plausible distractors from OTHER sentences (not meta-text)
-            other_sentences = [s for j, s in enumerate(sentences) if j != index % len(sentences)]
-            mcq_distractors = [s[:120] for s in other_sentences[:3]]
+            mcq_distractors = [s[:120] for s in other_sentences]
             items.append(
                 GeneratedItem(
                     item_type=ItemType.MCQ,
@@ -1372,7 +1692,7 @@ def _rule_based_fallback(
                     distractors=mcq_distractors,
                     tags=["auto"],
                     difficulty="medium",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.OPEN_QUESTION:
@@ -1383,7 +1703,7 @@ def _rule_based_fallback(
                     correct_answer="Attendus: definition, exemple, conclusion critique.",
                     tags=["open"],
                     difficulty="medium",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.FLASHCARDS:
@@ -1394,13 +1714,12 @@ def _rule_based_fallback(
                     correct_answer=sentence,
                     tags=["flashcard"],
                     difficulty="easy",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.POLL:
             # Build poll options from OTHER source sentences (not meta-text)
-            other_sentences = [s for j, s in enumerate(sentences) if j != index % len(sentences)]
-            poll_options = [s[:100] for s in other_sentences[:3]]
+            poll_options = [s[:100] for s in other_sentences]
             if len(poll_options) < 2:
                 poll_options = [
                     f"Aspect principal de: {sentences[0][:60]}",
@@ -1415,7 +1734,7 @@ def _rule_based_fallback(
                     answer_options=poll_options,
                     tags=["poll"],
                     difficulty="easy",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.CLOZE:
@@ -1426,14 +1745,15 @@ def _rule_based_fallback(
                     correct_answer="mot-cle",
                     tags=["cloze"],
                     difficulty="medium",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.MATCHING:
-            matching_pairs = _build_matching_fallback_pairs(
-                source_text=prepared_source,
-                desired_pairs=4,
-            )
+            if matching_pairs is None:
+                matching_pairs = _build_matching_fallback_pairs(
+                    source_text=prepared_source,
+                    desired_pairs=4,
+                )
             matching_payload = " || ".join(f"{left} -> {right}" for left, right in matching_pairs)
             items.append(
                 GeneratedItem(
@@ -1443,7 +1763,7 @@ def _rule_based_fallback(
                     answer_options=[f"{left} -> {right}" for left, right in matching_pairs],
                     tags=["matching"],
                     difficulty="medium",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         elif content_type == ContentType.BRAINSTORMING:
@@ -1454,7 +1774,7 @@ def _rule_based_fallback(
                     correct_answer="Categories: causes, effets, applications",
                     tags=["brainstorming"],
                     difficulty="easy",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
         else:
@@ -1465,70 +1785,115 @@ def _rule_based_fallback(
                     correct_answer=f"1) Introduction 2) Concepts cles 3) Exercices sur: {sentence[:80]}",
                     tags=[content_type.value],
                     difficulty="medium",
-                    source_reference=f"section:{(index % len(sentences)) + 1}",
+                    source_reference=source_reference,
                 )
             )
     return items
 
 
 def _sanitize_source_for_generation(source_text: str) -> str:
-    """Remove noisy technical lines and URLs from source text."""
+    """Remove noisy technical lines and URLs from source text.
+
+    The same source is sanitized many times per generation (prompt, pairs pool,
+    per-item coherence passes), so results are memoized in a small LRU keyed by
+    a digest of the source rather than by the (possibly huge) string itself.
+    """
 
     if not source_text.strip():
         return source_text
 
-    is_youtube_payload = bool(
-        re.search(r"^\s*source\s+youtube\s*:", source_text, flags=re.IGNORECASE | re.MULTILINE)
+    key = hashlib.blake2b(source_text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _SANITIZED_SOURCE_CACHE_LOCK:
+        cached = _SANITIZED_SOURCE_CACHE.get(key)
+        if cached is not None:
+            _SANITIZED_SOURCE_CACHE.move_to_end(key)
+            return cached
+
+    cleaned = _clean_source_text(source_text)
+    with _SANITIZED_SOURCE_CACHE_LOCK:
+        _SANITIZED_SOURCE_CACHE[key] = cleaned
+        if len(_SANITIZED_SOURCE_CACHE) > SANITIZED_SOURCE_CACHE_SIZE:
+            _SANITIZED_SOURCE_CACHE.popitem(last=False)
+    return cleaned
+
+
+def _clean_source_text(source_text: str) -> str:
+    is_youtube_payload = bool(YOUTUBE_SOURCE_HEADER_PATTERN.search(source_text))
+    noisy_hint_pattern = (
+        YOUTUBE_NOISY_SOURCE_HINT_PATTERN if is_youtube_payload else NOISY_SOURCE_HINT_PATTERN
     )
+    if "://" not in source_text and not noisy_hint_pattern.search(source_text):
+        # Nothing to drop: only the whitespace normalization below applies. When
+        # spaces and "\n" are the only whitespace and never touch a line edge,
+        # every line is already stripped and the split/join round trip is skipped.
+        if SOURCE_LINE_EDGE_WHITESPACE_PATTERN.search(source_text):
+            cleaned = "\n".join(raw_line.strip() for raw_line in source_text.splitlines())
+        else:
+            cleaned = source_text
+    else:
+        cleaned = "\n".join(_filter_noisy_source_lines(source_text, is_youtube_payload=is_youtube_payload))
+
+    # Substring probes are much cheaper than a regex pass that finds nothing.
+    if "\n\n\n" in cleaned:
+        cleaned = BLANK_LINE_RUN_PATTERN.sub("\n\n", cleaned)
+    if "  " in cleaned or "\t" in cleaned:
+        cleaned = INLINE_SPACE_RUN_PATTERN.sub(" ", cleaned)
+    return cleaned.strip()
+
+
+def _filter_noisy_source_lines(source_text: str, *, is_youtube_payload: bool) -> list[str]:
+    """Strip lines, dropping noise/metadata lines and URLs; blank lines are kept."""
+
+    noisy_line_pattern = (
+        YOUTUBE_NOISY_SOURCE_LINE_PATTERN if is_youtube_payload else NOISY_SOURCE_LINE_PATTERN
+    )
+    is_noisy_line = noisy_line_pattern.match
+    strip_urls = URL_PATTERN.sub
     kept_lines: list[str] = []
+    keep_line = kept_lines.append
     for raw_line in source_text.splitlines():
         line = raw_line.strip()
         if not line:
-            kept_lines.append("")
-            continue
-        if NOISY_SOURCE_LINE_PATTERN.match(line):
+            keep_line("")
             continue
-        if is_youtube_payload and re.match(r"^\s*(titre|chaine)\s*:", line, flags=re.IGNORECASE):
+        if is_noisy_line(line):
             continue
-        line = URL_PATTERN.sub("", line).strip()
-        if line:
-            kept_lines.append(line)
-
-    cleaned = "\n".join(kept_lines)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
-    cleaned = re.sub(r"[ \t]{2,}", " ", cleaned)
-    return cleaned.strip()
+        # Every URL match contains "://"; skip the substitution otherwise.
+        if "://" in line:
+            line = strip_urls("", line).strip()
+            if not line:
+                continue
+        keep_line(line)
+    return kept_lines
 
 
 def _sanitize_generated_item(item: GeneratedItem) -> GeneratedItem:
     """Strip URLs/source prefixes from generated item fields for better readability."""
 
     cleaned_prompt = _clean_generated_field(item.prompt) or item.prompt
-    return item.model_copy(
-        update={
-            "prompt": _strip_question_prefix(cleaned_prompt),
-            "correct_answer": _clean_generated_field(item.correct_answer),
-            "distractors": [_clean_generated_field(value) for value in item.distractors],
-            "answer_options": [_clean_generated_field(value) for value in item.answer_options],
-            "feedback": _clean_generated_field(item.feedback),
-        }
-    )
+    update = {
+        "prompt": _strip_question_prefix(cleaned_prompt),
+        "correct_answer": _clean_generated_field(item.correct_answer),
+        "distractors": [_clean_generated_field(value) for value in item.distractors],
+        "answer_options": [_clean_generated_field(value) for value in item.answer_options],
+        "feedback": _clean_generated_field(item.feedback),
+    }
+    # Well-formed items usually come out unchanged: reuse them instead of copying.
+    if all(getattr(item, field) == value for field, value in update.items()):
+        return item
+    return item.model_copy(update=update)
 
 
 def _clean_generated_field(value: str | None) -> str | None:
     if value is None:
         return None
 
-    cleaned = URL_PATTERN.sub("", value)
-    cleaned = re.sub(r"\bsource\s+(youtube|web)\s*:\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\bidentifiant\s+video\s*:\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\b(titre|chaine)\s*:\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\brecuperation\s+impossible\s*:\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\bfor\s+more\s+information\s+check\s*:\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(
-        r"\b(client|http)\s+error\s*['\"]?\d{3}[^:]*:\s*", "", cleaned, flags=re.IGNORECASE
-    )
-    cleaned = re.sub(r"\s{2,}", " ", cleaned).strip()
+    cleaned = value
+    if FIELD_NOISE_PATTERN.search(value):
+        # Each removal may expose a new match for the next pattern, so keep the ordered passes.
+        for pattern in FIELD_NOISE_PATTERNS:
+            cleaned = pattern.sub("", cleaned)
+    cleaned = WHITESPACE_GAP_PATTERN.sub(" ", cleaned).strip()
     return cleaned or value.strip()
 
 
@@ -1538,22 +1903,16 @@ def _extract_pronote_mode_sequence(*, instructions: str | None, max_items: int)
     if not instructions or max_items <= 0:
         return []
 
-    raw_payload: str | None = None
-    for line in instructions.splitlines():
-        stripped = line.strip()
-        if stripped.startswith(PRONOTE_MODES_JSON_PREFIX):
-            raw_payload = stripped[len(PRONOTE_MODES_JSON_PREFIX) :].strip()
-            break
-    if not raw_payload:
+    line_payload = _parse_pronote_modes_json_line(instructions)
+    if line_payload is None or not line_payload[0]:
         prefix_idx = instructions.lower().find(PRONOTE_MODES_JSON_PREFIX.lower())
         if prefix_idx >= 0:
             tail = instructions[prefix_idx + len(PRONOTE_MODES_JSON_PREFIX) :].lstrip()
             brace_idx = tail.find("{")
             if brace_idx >= 0:
                 tail = tail[brace_idx:]
-                decoder = json.JSONDecoder()
                 try:
-                    decoded_inline, _ = decoder.raw_decode(tail)
+                    decoded_inline, _ = JSON_DECODER.raw_decode(tail)
                 except json.JSONDecodeError:
                     decoded_inline = None
                 if isinstance(decoded_inline, Mapping):
@@ -1565,16 +1924,13 @@ def _extract_pronote_mode_sequence(*, instructions: str | None, max_items: int)
         else:
             return []
     else:
-        try:
-            decoded = json.loads(raw_payload)
-        except json.JSONDecodeError:
-            return []
+        decoded = line_payload[1]
         if not isinstance(decoded, Mapping):
             return []
 
     sequence: list[PronoteMode] = []
     for raw_mode, raw_count in decoded.items():
-        mode_name = _normalize_identifier(str(raw_mode))
+        mode_name = raw_mode if raw_mode in PRONOTE_MODES else _normalize_identifier(str(raw_mode))
         if mode_name not in PRONOTE_MODES:
             continue
         try:
@@ -1593,23 +1949,41 @@ def _extract_matching_pairs_per_question(instructions: str | None) -> int:
     """Read matching_pairs_per_question from PRONOTE_MODES_JSON in instructions."""
     if not instructions:
         return 3
+    line_payload = _parse_pronote_modes_json_line(instructions)
+    if line_payload is None:
+        return 3
+    decoded = line_payload[1]
+    if isinstance(decoded, Mapping):
+        val = decoded.get("matching_pairs_per_question")
+        if val is not None:
+            try:
+                return max(2, min(6, int(val)))
+            except (TypeError, ValueError):
+                pass
+    return 3
+
+
+@lru_cache(maxsize=4)
+def _parse_pronote_modes_json_line(instructions: str) -> tuple[str, Any] | None:
+    """Find the first PRONOTE_MODES_JSON line: (raw payload, decoded JSON or None).
+
+    Both the mode sequence and the pairs-per-question readers need it for the
+    same instructions, so it is split and decoded once. Callers must not
+    mutate the decoded payload.
+    """
+
+    if PRONOTE_MODES_JSON_PREFIX not in instructions:
+        return None
     for line in instructions.splitlines():
         stripped = line.strip()
         if stripped.startswith(PRONOTE_MODES_JSON_PREFIX):
-            raw = stripped[len(PRONOTE_MODES_JSON_PREFIX):].strip()
+            raw_payload = stripped[len(PRONOTE_MODES_JSON_PREFIX) :].strip()
             try:
-                decoded = json.loads(raw)
+                decoded = json.loads(raw_payload)
             except json.JSONDecodeError:
-                return 3
-            if isinstance(decoded, Mapping):
-                val = decoded.get("matching_pairs_per_question")
-                if val is not None:
-                    try:
-                        return max(2, min(6, int(val)))
-                    except (TypeError, ValueError):
-                        pass
-            return 3
-    return 3
+                decoded = None
+            return raw_payload, decoded
+    return None
 
 
 def _enforce_pronote_mode_coherence(
@@ -1643,6 +2017,7 @@ def _enforce_pronote_mode_coherence(
     matching_index = 0
     # Track globally consumed pairs to avoid duplicates across questions.
     used_pair_keys: set[tuple[str, str]] = set()
+    matching_pool_keys = [_matching_pair_key(pair) for pair in matching_pool]
 
     coerced: list[GeneratedItem] = []
     for index, item in enumerate(items):
@@ -1653,10 +2028,7 @@ def _enforce_pronote_mode_coherence(
 
         # For association questions, filter pool to exclude already-used pairs.
         if mode == "association_pairs" and matching_pool:
-            available_pool = [
-                p for p in matching_pool
-                if (p[0].strip().lower(), p[1].strip().lower()) not in used_pair_keys
-            ]
+            available_pool = _unused_matching_pairs(matching_pool, matching_pool_keys, used_pair_keys)
             if len(available_pool) < 2:
                 available_pool = matching_pool  # fallback: allow reuse
         else:
@@ -1674,10 +2046,11 @@ def _enforce_pronote_mode_coherence(
         coerced.append(result)
         if mode == "association_pairs":
             # Mark pairs from this question as used.
+            # Separators are tried in priority order, not by position in the option.
             for opt in result.answer_options:
                 for sep in ("->", "=>", "→"):
-                    if sep in opt:
-                        raw_l, raw_r = opt.split(sep, 1)
+                    raw_l, found, raw_r = opt.partition(sep)
+                    if found:
                         used_pair_keys.add((raw_l.strip().lower(), raw_r.strip().lower()))
                         break
             matching_index += 1
@@ -1687,13 +2060,12 @@ def _enforce_pronote_mode_coherence(
 def _looks_like_matching_item_payload(item: GeneratedItem) -> bool:
     if item.item_type == ItemType.MATCHING:
         return True
-    normalized_tags = {_normalize_identifier(tag) for tag in item.tags}
-    if {"matching", "association", "association_pairs"} & normalized_tags:
+    if any(_normalize_identifier(tag) in MATCHING_ITEM_TAGS for tag in item.tags):
         return True
-    correct = item.correct_answer or ""
-    if any(token in correct for token in ("->", "=>", "→", "-&gt;")):
+    has_arrow = MATCHING_ARROW_PATTERN.search
+    if item.correct_answer and has_arrow(item.correct_answer):
         return True
-    return any(any(token in option for token in ("->", "=>", "→", "-&gt;")) for option in item.answer_options)
+    return any(has_arrow(option) for option in item.answer_options)
 
 
 def _enforce_matching_item_coherence(
@@ -1727,6 +2099,7 @@ def _enforce_matching_item_coherence(
     coerced: list[GeneratedItem] = []
     # Track globally consumed pairs to avoid duplicates across questions.
     used_pair_keys: set[tuple[str, str]] = set()
+    matching_pool_keys = [_matching_pair_key(pair) for pair in matching_pool]
 
     for item in items:
         if not _looks_like_matching_item_payload(item):
@@ -1737,14 +2110,12 @@ def _enforce_matching_item_coherence(
         extracted_pairs = _extract_matching_pairs(item=item, source_text=source_text)
         is_pronote_matching = bool(
             {"pronote", "association_pairs"} & normalized_tags
-            or any(tag in PRONOTE_MODES for tag in normalized_tags)
+            or not PRONOTE_MODES.isdisjoint(normalized_tags)
         )
         if is_pronote_matching and _matching_pairs_are_pronote_ready(extracted_pairs):
             # Filter out globally used pairs before accepting pronote-ready items.
-            filtered_pairs = [
-                p for p in extracted_pairs
-                if (p[0].strip().lower(), p[1].strip().lower()) not in used_pair_keys
-            ]
+            extracted_keys = [_matching_pair_key(pair) for pair in extracted_pairs]
+            filtered_pairs = _unused_matching_pairs(extracted_pairs, extracted_keys, used_pair_keys)
             if len(filtered_pairs) < 2:
                 filtered_pairs = extracted_pairs  # fallback: allow reuse
             tags = ["matching", *item.tags]
@@ -1752,7 +2123,7 @@ def _enforce_matching_item_coherence(
                 tags.append("association_pairs")
             deduped_tags = _dedupe_strings(tags)
             prompt = _strip_question_prefix(item.prompt or "").strip()
-            if not re.search(r"\bassoc(?:ier|iez|iation)\b", prompt, flags=re.IGNORECASE):
+            if not ASSOCIATION_PROMPT_PATTERN.search(prompt):
                 prompt = "Associez chaque notion du texte a sa definition ou a sa caracteristique correspondante."
             coerced.append(
                 item.model_copy(
@@ -1766,8 +2137,7 @@ def _enforce_matching_item_coherence(
                     }
                 )
             )
-            for left, right in filtered_pairs:
-                used_pair_keys.add((left.strip().lower(), right.strip().lower()))
+            used_pair_keys.update(_matching_pair_key(pair) for pair in filtered_pairs)
             matching_index += 1
             continue
 
@@ -1780,11 +2150,13 @@ def _enforce_matching_item_coherence(
         desired_pairs = pairs_per_question if pair_pool_size >= min_needed else max(2, pairs_per_question - 1)
 
         # Filter pool to exclude globally used pairs.
-        active_pool = extracted_pairs if extracted_pairs else matching_pool
-        available_pool = [
-            p for p in active_pool
-            if (p[0].strip().lower(), p[1].strip().lower()) not in used_pair_keys
-        ]
+        if extracted_pairs:
+            active_pool = extracted_pairs
+            active_pool_keys = [_matching_pair_key(pair) for pair in extracted_pairs]
+        else:
+            active_pool = matching_pool
+            active_pool_keys = matching_pool_keys
+        available_pool = _unused_matching_pairs(active_pool, active_pool_keys, used_pair_keys)
         if len(available_pool) < desired_pairs:
             available_pool = active_pool  # fallback: allow reuse if pool exhausted
 
@@ -1794,10 +2166,7 @@ def _enforce_matching_item_coherence(
             desired_pairs=desired_pairs,
         )
         if len(pairs) < 2 and matching_pool:
-            available_fallback = [
-                p for p in matching_pool
-                if (p[0].strip().lower(), p[1].strip().lower()) not in used_pair_keys
-            ]
+            available_fallback = _unused_matching_pairs(matching_pool, matching_pool_keys, used_pair_keys)
             if len(available_fallback) < 2:
                 available_fallback = matching_pool
             pairs = _select_matching_pairs_variant(
@@ -1806,22 +2175,18 @@ def _enforce_matching_item_coherence(
                 desired_pairs=desired_pairs,
             )
         if len(pairs) < 2:
-            pairs = [
-                ("Concept principal", "Definition complete basee sur le texte source."),
-                ("Notion cle", "Lien explicite avec le contenu pedagogique fourni."),
-                ("Exemple concret", "Illustration precise qui aide a valider la comprehension."),
-            ]
+            pairs = list(DEFAULT_MATCHING_PAIRS)
 
         tags = ["matching", *item.tags]
         if (
             "pronote" in normalized_tags
             or "association_pairs" in normalized_tags
-            or any(tag in PRONOTE_MODES for tag in normalized_tags)
+            or not PRONOTE_MODES.isdisjoint(normalized_tags)
         ):
             tags.append("association_pairs")
         deduped_tags = _dedupe_strings(tags)
         prompt = _strip_question_prefix(item.prompt or "").strip()
-        if not re.search(r"\bassoc(?:ier|iez|iation)\b", prompt, flags=re.IGNORECASE):
+        if not ASSOCIATION_PROMPT_PATTERN.search(prompt):
             prompt = "Associez chaque notion du texte a sa definition ou a sa caracteristique correspondante."
 
         coerced.append(
@@ -1836,13 +2201,26 @@ def _enforce_matching_item_coherence(
                 }
             )
         )
-        for left, right in pairs:
-            used_pair_keys.add((left.strip().lower(), right.strip().lower()))
+        used_pair_keys.update(_matching_pair_key(pair) for pair in pairs)
         matching_index += 1
 
     return coerced
 
 
+def _matching_pair_key(pair: tuple[str, str]) -> tuple[str, str]:
+    return pair[0].strip().lower(), pair[1].strip().lower()
+
+
+def _unused_matching_pairs(
+    pairs: list[tuple[str, str]],
+    pair_keys: list[tuple[str, str]],
+    used_pair_keys: set[tuple[str, str]],
+) -> list[tuple[str, str]]:
+    """Keep pairs whose precomputed key (see ``_matching_pair_key``) is not used yet."""
+
+    return [pair for pair, key in zip(pairs, pair_keys) if key not in used_pair_keys]
+
+
 def _coerce_item_for_pronote_mode(
     *,
     item: GeneratedItem,
@@ -1857,7 +2235,7 @@ def _coerce_item_for_pronote_mode(
 
     prompt = _strip_question_prefix(item.prompt or "").strip()
     tags = _dedupe_strings([*item.tags, "pronote", mode])
-    difficulty = item.difficulty if item.difficulty in {"easy", "medium", "hard"} else "medium"
+    difficulty = item.difficulty if item.difficulty in ITEM_DIFFICULTIES else "medium"
 
     if mode == "single_choice":
         correct = _normalize_short_text(item.correct_answer) or _pick_first_text(
@@ -1975,52 +2353,39 @@ def _coerce_item_for_pronote_mode(
             variant_index=association_index,
             desired_pairs=desired_pairs,
         )
+        # Selection is deterministic: never re-select from source_pairs twice.
+        selected_from_source = pair_pool is source_pairs
         if len(pairs) < 2 and extracted_pairs and source_pairs:
             pairs = _select_matching_pairs_variant(
                 source_pairs,
                 variant_index=association_index,
                 desired_pairs=desired_pairs,
             )
-        if not _matching_pairs_are_pronote_ready(pairs) and source_pairs:
+            selected_from_source = True
+        pairs_ready = _matching_pairs_are_pronote_ready(pairs)
+        if not pairs_ready and source_pairs and not selected_from_source:
             pairs = _select_matching_pairs_variant(
                 source_pairs,
                 variant_index=association_index,
                 desired_pairs=desired_pairs,
             )
-        if not _matching_pairs_are_pronote_ready(pairs):
+            pairs_ready = _matching_pairs_are_pronote_ready(pairs)
+        if not pairs_ready:
             pairs = [
                 pair
                 for pair in pairs
                 if _is_valid_matching_pair(pair[0], pair[1]) and len(pair[1].split()) >= 4
             ]
-        if not _matching_pairs_are_pronote_ready(pairs):
-            pairs = [
-                ("Concept principal", "Definition complete basee sur le texte source."),
-                ("Notion cle", "Lien explicite avec le contenu pedagogique fourni."),
-                ("Exemple concret", "Illustration precise qui aide a valider la comprehension."),
-            ]
+            pairs_ready = _matching_pairs_are_pronote_ready(pairs)
+        if not pairs_ready:
+            pairs = list(DEFAULT_MATCHING_PAIRS)
         formatted_pairs = " || ".join(f"{left} -> {right}" for left, right in pairs)
-        preserved_tags = [
-            tag
-            for tag in item.tags
-            if _normalize_identifier(tag)
-            not in {
-                "mcq",
-                "open_question",
-                "poll",
-                "cloze",
-                "matching",
-                "flashcard",
-                "course_structure",
-                "brainstorming",
-            }
-        ]
+        preserved_tags = [tag for tag in item.tags if _normalize_identifier(tag) not in MATCHING_MODE_EXCLUDED_TAGS]
         association_tags = _dedupe_strings([*preserved_tags, "matching", "pronote", "association_pairs"])
-        association_prompt = _build_association_prompt_from_pairs(pairs)
         return item.model_copy(
             update={
                 "item_type": ItemType.MATCHING,
-                "prompt": _ensure_question_mark(association_prompt),
+                "prompt": MATCHING_ASSOCIATION_PROMPT,
                 "correct_answer": formatted_pairs,
                 "distractors": [],
                 "answer_options": [f"{left} -> {right}" for left, right in pairs],
@@ -2029,7 +2394,7 @@ def _coerce_item_for_pronote_mode(
             }
         )
 
-    if mode in {"cloze_free", "cloze_list_unique", "cloze_list_variable"}:
+    if mode in CLOZE_PRONOTE_MODES:
         cloze_prompt = prompt
         if "____" not in cloze_prompt and "{:MULTICHOICE:" not in cloze_prompt:
             cloze_prompt = f"{cloze_prompt.rstrip(' .')} ____.".strip() if cloze_prompt else "Completez: ____."
@@ -2038,7 +2403,8 @@ def _coerce_item_for_pronote_mode(
         if mode == "cloze_free":
             distractors = []
         else:
-            distractors = [value for value in distractors if value.lower() != correct.lower()]
+            correct_key = correct.lower()
+            distractors = [value for value in distractors if value.lower() != correct_key]
             if len(distractors) < 3:
                 distractors.extend(_default_mcq_distractors(existing=distractors))
             distractors = distractors[:3]
@@ -2086,26 +2452,13 @@ def _select_matching_pairs_variant(
         offset = variant_index % len(deduped)
         return deduped[offset:] + deduped[:offset]
 
-    selected: list[tuple[str, str]] = []
+    # Pairs are unique and outnumber desired_pairs: take a window of the
+    # rotated pool, wrapping around its end when needed.
     start = (variant_index * desired_pairs) % len(deduped)
-    cursor = start
-    attempts = 0
-    while len(selected) < desired_pairs and attempts < len(deduped) * 2:
-        pair = deduped[cursor % len(deduped)]
-        if pair not in selected:
-            selected.append(pair)
-        cursor += 1
-        attempts += 1
-
+    selected = deduped[start : start + desired_pairs]
     if len(selected) < desired_pairs:
-        for pair in deduped:
-            if pair in selected:
-                continue
-            selected.append(pair)
-            if len(selected) >= desired_pairs:
-                break
-
-    return selected[:desired_pairs]
+        selected.extend(deduped[: desired_pairs - len(selected)])
+    return selected
 
 
 def _strip_question_prefix(value: str) -> str:
@@ -2122,6 +2475,8 @@ def _strip_question_prefix(value: str) -> str:
 
 
 def _ensure_question_mark(value: str) -> str:
+    if value.endswith("?") and not value[:1].isspace():
+        return value
     text = value.strip()
     if not text:
         return text
@@ -2135,10 +2490,10 @@ def _ensure_question_mark(value: str) -> str:
 def _normalize_short_text(value: str | None) -> str | None:
     if value is None:
         return None
-    cleaned = re.sub(r"\s+", " ", value).strip()
+    cleaned = " ".join(value.split())
     if not cleaned:
         return None
-    cleaned = re.sub(r"^\s*reponse\s*[:\-]\s*", "", cleaned, flags=re.IGNORECASE).strip()
+    cleaned = ANSWER_LABEL_PREFIX_PATTERN.sub("", cleaned).strip()
     return cleaned or None
 
 
@@ -2151,10 +2506,11 @@ def _pick_first_text(values: list[str]) -> str | None:
 
 
 def _coerce_mcq_distractors(*, item: GeneratedItem, correct: str) -> list[str]:
+    correct_key = correct.lower()
     distractors = _dedupe_strings(
         [
             *item.distractors,
-            *[option for option in item.answer_options if option.strip().lower() != correct.lower()],
+            *[option for option in item.answer_options if option.strip().lower() != correct_key],
         ]
     )
     if len(distractors) < 3:
@@ -2163,34 +2519,19 @@ def _coerce_mcq_distractors(*, item: GeneratedItem, correct: str) -> list[str]:
 
 
 def _coerce_poll_options(*, item: GeneratedItem) -> list[str]:
-    options = _dedupe_strings([*item.answer_options, *item.distractors])
-    if item.correct_answer:
-        options = _dedupe_strings(
-            [
-                *options,
-                *[
-                    part.strip()
-                    for part in re.split(r"\|\||;|\n", item.correct_answer)
-                    if part and part.strip()
-                ],
-            ]
-        )
-    return _dedupe_strings(options)[:6]
+    # One pass over every source: _dedupe_strings strips, drops blanks and keeps first spellings.
+    answer_parts = ANSWER_PART_SEPARATOR_PATTERN.split(item.correct_answer) if item.correct_answer else []
+    return _dedupe_strings([*item.answer_options, *item.distractors, *answer_parts])[:6]
 
 
 def _coerce_multiple_choice_expected_answers(*, raw_expected: str | None, options: list[str]) -> list[str]:
-    expected = _dedupe_strings(
-        [
-            part.strip()
-            for part in re.split(r"\|\||;|\n", raw_expected or "")
-            if part and part.strip()
-        ]
-    )
+    expected = _dedupe_strings(ANSWER_PART_SEPARATOR_PATTERN.split(raw_expected or ""))
     if not expected and options:
         expected = options[: min(2, len(options))]
     if len(expected) == 1 and len(options) >= 2:
+        expected_key = expected[0].strip().lower()
         for option in options:
-            if option.strip().lower() != expected[0].strip().lower():
+            if option.strip().lower() != expected_key:
                 expected.append(option)
                 break
     return expected[:3]
@@ -2207,9 +2548,8 @@ def _extract_numeric_answer(*texts: str) -> str:
 
 def _extract_spelling_answer(correct_answer: str, source_text: str) -> str:
     for text in (correct_answer, source_text):
-        for token in re.findall(r"[A-Za-z][A-Za-z'-]{2,}", text or ""):
-            lowered = token.lower()
-            if lowered in {"quelle", "quelles", "comment", "pourquoi", "avec", "dans", "sans"}:
+        for token in SPELLING_WORD_PATTERN.findall(text or ""):
+            if token.lower() in SPELLING_STOP_TOKENS:
                 continue
             return token
     return "mot"
@@ -2220,17 +2560,25 @@ def _split_informative_sentences(
 ) -> list[str]:
     """Split source text into deduped informative sentence-like fragments."""
 
+    return list(_informative_sentences(source_text, minimum_length, limit))
+
+
+@lru_cache(maxsize=8)
+def _informative_sentences(source_text: str, minimum_length: int, limit: int) -> tuple[str, ...]:
+    # Every item of a PRONOTE batch re-splits the same sanitized source (fallback
+    # items, matching pools, per-item pair extraction): split it once per shape.
     if not source_text.strip():
-        return []
+        return ()
 
-    chunks = re.split(r"(?:[.!?]\s+|\n+)", source_text.strip())
+    chunks = SENTENCE_BREAK_PATTERN.split(source_text.strip())
     deduped: list[str] = []
     seen: set[str] = set()
     for chunk in chunks:
-        sentence = re.sub(r"\s+", " ", chunk).strip(" -:;,.")
+        sentence = " ".join(chunk.split()).strip(" -:;,.")
         if len(sentence) < minimum_length:
             continue
-        if len(sentence.split()) < 5:
+        # Words are now separated by exactly one space: four spaces mean five words.
+        if sentence.count(" ") < 4:
             continue
         key = sentence.lower()
         if key in seen:
@@ -2239,22 +2587,24 @@ def _split_informative_sentences(
         deduped.append(sentence)
         if len(deduped) >= limit:
             break
-    return deduped
+    return tuple(deduped)
 
 
 def _looks_definition_like_text(value: str) -> bool:
-    cleaned = re.sub(r"\s+", " ", (value or "")).strip()
+    cleaned = " ".join((value or "").split())
     if not cleaned or "?" in cleaned:
         return False
     return bool(MATCHING_DEFINITION_CUE_PATTERN.search(cleaned))
 
 
 def _normalize_matching_side(value: str, *, max_words: int, min_words: int = 1) -> str | None:
-    cleaned = re.sub(r"\s+", " ", (value or "")).strip(" -:;,.")
+    cleaned = " ".join((value or "").split()).strip(" -:;,.")
     if not cleaned:
         return None
     cleaned = _strip_question_prefix(cleaned)
-    cleaned = re.sub(r"^[\W_]+|[\W_]+$", "", cleaned).strip()
+    # The regex only trims [\W_] runs at the edges; alphanumeric edges need no pass.
+    if not (cleaned[:1].isalnum() and cleaned[-1:].isalnum()):
+        cleaned = MATCHING_EDGE_NON_WORD_PATTERN.sub("", cleaned).strip()
     if not cleaned:
         return None
     # Fix unclosed parentheses left by the trailing non-word strip above.
@@ -2272,7 +2622,7 @@ def _normalize_matching_side(value: str, *, max_words: int, min_words: int = 1)
 
 
 def _normalize_matching_left_display(value: str) -> str:
-    cleaned = re.sub(r"\s+", " ", (value or "")).strip()
+    cleaned = " ".join((value or "").split())
     if not cleaned:
         return cleaned
     if cleaned[0].isalpha() and cleaned[0].islower():
@@ -2281,10 +2631,10 @@ def _normalize_matching_left_display(value: str) -> str:
 
 
 def _is_generic_matching_left_label(value: str) -> bool:
-    cleaned = re.sub(r"\s+", " ", (value or "")).strip(" -:;,.")
+    cleaned = " ".join((value or "").split()).strip(" -:;,.")
     if not cleaned:
         return True
-    tokens = re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9'-]+", cleaned)
+    tokens = MATCHING_WORD_TOKEN_PATTERN.findall(cleaned)
     if not tokens:
         return True
 
@@ -2299,14 +2649,14 @@ def _is_generic_matching_left_label(value: str) -> bool:
 
     if content_tokens[0] in MATCHING_LEFT_BAD_START_TOKENS:
         return True
-    if any(token in MATCHING_LEFT_FORBIDDEN_TOKENS for token in content_tokens):
+    if not MATCHING_LEFT_FORBIDDEN_TOKENS.isdisjoint(content_tokens):
         return True
 
     # Reject isolated generic labels (except explicit acronyms like TCP, IPv4).
     if len(tokens) == 1:
         sole = tokens[0].strip()
         sole_norm = content_tokens[0]
-        is_acronym = bool(re.fullmatch(r"[A-Z0-9]{2,10}", sole))
+        is_acronym = bool(MATCHING_ACRONYM_PATTERN.fullmatch(sole))
         if not is_acronym:
             return True
         if sole_norm in MATCHING_GENERIC_SINGLE_LABEL_TOKENS:
@@ -2316,32 +2666,17 @@ def _is_generic_matching_left_label(value: str) -> bool:
 
 
 def _normalize_matching_left_candidate(value: str) -> str:
-    cleaned = re.sub(r"\s+", " ", (value or "")).strip(" -:;,.")
+    cleaned = " ".join((value or "").split()).strip(" -:;,.")
     if not cleaned:
         return cleaned
     phrase_match = MATCHING_LEFT_ARTICLE_PHRASE_PATTERN.search(cleaned)
     if phrase_match:
         cleaned = phrase_match.group(1).strip()
-    cleaned = re.sub(
-        r"^\s*(?:toutes?\s+|tous\s+|chaque\s+|certaines?\s+|certains?\s+|ces\s+)",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    ).strip()
-    # Split on French relative pronouns / punctuation — require word boundary
-    # on BOTH sides to avoid matching inside words like "analogique", "numérique".
-    cleaned = re.split(
-        r"\s*(?:,|;|qu[‘’]|\bqui\b|\bque\b|\bdont\b)\s*",
-        cleaned,
-        maxsplit=1,
-        flags=re.IGNORECASE,
-    )[0].strip()
-    cleaned = re.sub(
-        r"\s+(?:de|du|des|d[‘’]?|pour|avec|sans|dans|sur|en|par|vers|et|ou)$",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    ).strip()
+    cleaned = MATCHING_LEFT_QUANTIFIER_PREFIX_PATTERN.sub("", cleaned).strip()
+    cleaned = MATCHING_LEFT_CLAUSE_SPLIT_PATTERN.split(cleaned, maxsplit=1)[0].strip()
+    # Connectors are at most four letters, so a match needs a space in the last five characters.
+    if " " in cleaned[-5:]:
+        cleaned = MATCHING_LEFT_TRAILING_CONNECTOR_PATTERN.sub("", cleaned).strip()
     return cleaned
 
 
@@ -2351,61 +2686,118 @@ def _coerce_matching_definition(left: str, right_raw: str) -> str | None:
     if not right:
         return None
     right = MATCHING_DEFINITION_PREFIX_PATTERN.sub("", right).strip(" -:;,.")
-    right = re.sub(r"^\s*est\s+le\s+suivant\s*,?\s*", "", right, flags=re.IGNORECASE)
-    if MATCHING_CEST_A_DIRE_PATTERN.search(right):
-        _, suffix = MATCHING_CEST_A_DIRE_PATTERN.split(right, maxsplit=1)
-        right = suffix.strip(" -:;,.")
-    right = re.sub(r"\s*;\s*", ", ", right)
+    right = MATCHING_SUIVANT_PREFIX_PATTERN.sub("", right)
+    right = _drop_through_cest_a_dire(right)
+    if ";" in right:
+        right = MATCHING_SEMICOLON_PATTERN.sub(", ", right)
     if not right:
         return None
-    left_cleaned = re.sub(r"\s+", " ", left).strip()
+    left_cleaned = " ".join(left.split())
     left_core = _strip_matching_leading_articles(left_cleaned)
     if left_cleaned:
-        right = re.sub(rf"^\s*{re.escape(left_cleaned)}\s*[,:-]?\s*", "", right, flags=re.IGNORECASE)
+        right = _strip_leading_label(right, left_cleaned)
     if left_core and left_core.lower() != left_cleaned.lower():
-        right = re.sub(rf"^\s*{re.escape(left_core)}\s*[,:-]?\s*", "", right, flags=re.IGNORECASE)
+        right = _strip_leading_label(right, left_core)
     if left_core:
-        right = re.sub(
-            rf"^\s*(?:l['’]|le|la|les|un|une|des|du)\s+{re.escape(left_core)}\s*[,:-]?\s*",
-            "",
-            right,
-            flags=re.IGNORECASE,
-        )
+        right = _strip_leading_label(right, left_core, with_article=True)
     right = MATCHING_INTRO_NOISE_PATTERN.sub("", right).strip(" -:;,.")
-    right = re.sub(r"^\s*que\s+", "", right, flags=re.IGNORECASE)
-    if MATCHING_CEST_A_DIRE_PATTERN.search(right):
-        _, suffix = MATCHING_CEST_A_DIRE_PATTERN.split(right, maxsplit=1)
-        right = suffix.strip(" -:;,.")
+    right = MATCHING_QUE_PREFIX_PATTERN.sub("", right)
+    right = _drop_through_cest_a_dire(right)
     if MATCHING_WEAK_DEFINITION_PATTERN.match(right):
         return None
     # Strip bare copulas "est/sont" + optional article to produce a self-contained
     # noun-phrase definition.  Keep meaningful predicate verbs and just capitalise.
-    copula_match = MATCHING_COPULA_ARTICLE_PATTERN.match(right)
-    if copula_match and MATCHING_PREDICATE_PREFIX_PATTERN.match(right):
-        stripped = right[copula_match.end():]
+    if MATCHING_PREDICATE_PREFIX_PATTERN.match(right):
+        copula_match = MATCHING_COPULA_ARTICLE_PATTERN.match(right)
+        stripped = right[copula_match.end():] if copula_match else ""
         if stripped and len(stripped.split()) >= MATCHING_RIGHT_MIN_WORDS:
             right = stripped[0].upper() + stripped[1:]
         else:
             right = right[0].upper() + right[1:]
-    elif MATCHING_PREDICATE_PREFIX_PATTERN.match(right):
-        right = right[0].upper() + right[1:]
     right = _normalize_matching_side(right, max_words=34, min_words=MATCHING_RIGHT_MIN_WORDS)
     if right and MATCHING_RIGHT_NOISY_START_PATTERN.match(right):
         right = None
-    if right and MATCHING_RIGHT_BAD_END_PATTERN.search(right):
+    if right and _has_bad_matching_right_end(right):
         right = None
     if not right and raw_right and not MATCHING_RIGHT_NOISY_START_PATTERN.match(raw_right):
         # Keep full, explicit sentence when cleanup removed too much context.
         right = raw_right
-    if right and MATCHING_RIGHT_BAD_END_PATTERN.search(right):
+    if right and _has_bad_matching_right_end(right):
         return None
     if right and MATCHING_WEAK_DEFINITION_PATTERN.match(right):
         return None
     return right
 
 
+def _drop_through_cest_a_dire(value: str) -> str:
+    """Keep only what follows the first "c'est-a-dire", found in a single scan."""
+
+    match = MATCHING_CEST_A_DIRE_PATTERN.search(value)
+    return value[match.end() :].strip(" -:;,.") if match else value
+
+
+def _has_bad_matching_right_end(value: str) -> bool:
+    """Whether a definition ends on a dangling connector or punctuation.
+
+    The scan starts near the end instead of at every position; ``\\b`` still
+    sees the character before ``pos``, so the result matches a full search.
+    """
+
+    start = max(0, len(value) - MATCHING_RIGHT_BAD_END_WINDOW)
+    return MATCHING_RIGHT_BAD_END_PATTERN.search(value, start) is not None
+
+
+def _strip_leading_label(
+    text: str,
+    label: str,
+    *,
+    with_article: bool = False,
+    with_separator: bool = True,
+) -> str:
+    """Drop a leading ``label`` (case-insensitive) from ``text``.
+
+    Equivalent to ``re.sub(rf"^\s*{article}{re.escape(label)}\s*[,:-]?\s*", "", text,
+    flags=re.IGNORECASE)``. ASCII text is handled with plain string operations so
+    each new label does not cost a regex compile; anything else goes through the
+    cached pattern, which keeps Unicode case-insensitive matching identical.
+    """
+
+    if not (text.isascii() and label.isascii()) or label != label.strip():
+        pattern = _leading_label_pattern(label, with_article=with_article, with_separator=with_separator)
+        return pattern.sub("", text)
+
+    rest = text.lstrip()
+    if with_article:
+        for article in MATCHING_LABEL_ARTICLES:
+            after_article = rest[len(article) :]
+            if rest[: len(article)].lower() == article and after_article[:1].isspace():
+                stripped = _strip_ascii_label(after_article.lstrip(), label, with_separator=with_separator)
+                if stripped is not None:
+                    return stripped
+        return text
+    stripped = _strip_ascii_label(rest, label, with_separator=with_separator)
+    return text if stripped is None else stripped
+
+
+def _strip_ascii_label(text: str, label: str, *, with_separator: bool) -> str | None:
+    if text[: len(label)].lower() != label.lower():
+        return None
+    rest = text[len(label) :].lstrip()
+    if with_separator and rest[:1] in (",", ":", "-"):
+        rest = rest[1:].lstrip()
+    return rest
+
+
+@lru_cache(maxsize=512)
+def _leading_label_pattern(label: str, *, with_article: bool, with_separator: bool) -> re.Pattern[str]:
+    article = r"(?:l['’]|le|la|les|un|une|des|du)\s+" if with_article else ""
+    separator = r"[,:-]?\s*" if with_separator else ""
+    return re.compile(rf"^\s*{article}{re.escape(label)}\s*{separator}", flags=re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
 def _strip_matching_leading_articles(value: str) -> str:
-    cleaned = re.sub(r"\s+", " ", value).strip()
+    cleaned = " ".join(value.split())
     changed = True
     while changed:
         changed = False
@@ -2416,33 +2808,43 @@ def _strip_matching_leading_articles(value: str) -> str:
     return cleaned
 
 
-def _is_valid_matching_pair(left: str, right: str) -> bool:
-    left_cleaned = re.sub(r"\s+", " ", left).strip(" -:;,.")
-    right_cleaned = re.sub(r"\s+", " ", right).strip(" -:;,.")
-    if not left_cleaned or not right_cleaned:
+@lru_cache(maxsize=4096)
+def _matching_left_identifier(left: str) -> str:
+    return _normalize_identifier(_strip_matching_leading_articles(left))
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_matching_left(left_cleaned: str) -> bool:
+    """Left-only checks of _is_valid_matching_pair on an already cleaned label.
+
+    Split out so candidate builders can reject a label before paying for the
+    definition clean-up of its right side.
+    """
+
+    if not left_cleaned:
         return False
-    if any(symbol in left_cleaned for symbol in (",", ";", ":")):
+    if "," in left_cleaned or ";" in left_cleaned or ":" in left_cleaned:
         return False
     if _is_generic_matching_left_label(left_cleaned):
         return False
     if MATCHING_WEAK_CERTAINTY_PATTERN.search(left_cleaned):
         return False
-    if MATCHING_WEAK_CERTAINTY_PATTERN.search(right_cleaned):
-        return False
 
     left_core = _strip_matching_leading_articles(left_cleaned)
-    if MATCHING_LEFT_NOISY_PHRASE_PATTERN.match(left_cleaned):
+    if MATCHING_LEFT_REJECT_PREFIX_PATTERN.match(left_cleaned):
         return False
-    if re.search(r"\b(?:qui|que|qu['’]|dont)\b", left_cleaned, flags=re.IGNORECASE):
+    if MATCHING_RELATIVE_PRONOUN_PATTERN.search(left_cleaned):
         return False
-    left_tokens = re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9'-]+", left_core)
+    left_tokens = MATCHING_WORD_TOKEN_PATTERN.findall(left_core)
     if not left_tokens:
         return False
-    first_token = _normalize_identifier(left_tokens[0])
+    # Fold every token once; all token-set checks below reuse these keys.
+    folded_tokens = [_normalize_identifier(token) for token in left_tokens]
+    first_token = folded_tokens[0]
     if first_token in MATCHING_LEFT_BAD_START_TOKENS:
         return False
     if len(left_tokens) < 2:
-        lone = _normalize_identifier(left_tokens[0])
+        lone = first_token
         if not (
             len(lone) >= 4
             and lone not in MATCHING_GENERIC_SINGLE_LABEL_TOKENS
@@ -2453,11 +2855,11 @@ def _is_valid_matching_pair(left: str, right: str) -> bool:
     if any(len(token.strip("'’-")) <= 1 for token in left_tokens):
         return False
     content_tokens = [
-        token
-        for token in left_tokens
-        if _normalize_identifier(token) not in MATCHING_GENERIC_TOKEN_STOPWORDS
+        folded
+        for folded in folded_tokens
+        if folded not in MATCHING_GENERIC_TOKEN_STOPWORDS
     ]
-    if any(_normalize_identifier(token) in MATCHING_LEFT_FORBIDDEN_TOKENS for token in left_tokens):
+    if not MATCHING_LEFT_FORBIDDEN_TOKENS.isdisjoint(folded_tokens):
         return False
     if len(content_tokens) < 2:
         # Accept simple labels such as "Le routeur" or "Conduction" when they
@@ -2465,9 +2867,9 @@ def _is_valid_matching_pair(left: str, right: str) -> bool:
         if not (
             len(content_tokens) == 1
             and len(left_tokens) <= 3
-            and len(_normalize_identifier(content_tokens[0])) >= 4
-            and _normalize_identifier(content_tokens[0]) not in MATCHING_GENERIC_SINGLE_LABEL_TOKENS
-            and _normalize_identifier(content_tokens[0]) not in MATCHING_STOPWORDS
+            and len(content_tokens[0]) >= 4
+            and content_tokens[0] not in MATCHING_GENERIC_SINGLE_LABEL_TOKENS
+            and content_tokens[0] not in MATCHING_STOPWORDS
             and (
                 MATCHING_LEADING_ARTICLE_PATTERN.match(left_cleaned)
                 or len(left_tokens) == 1
@@ -2478,40 +2880,55 @@ def _is_valid_matching_pair(left: str, right: str) -> bool:
         return False
 
     left_key = _normalize_identifier(left_cleaned)
-    right_key = _normalize_identifier(right_cleaned)
-    if not left_key or not right_key:
+    if not left_key or left_key in MATCHING_STOPWORDS:
         return False
-    if left_key in MATCHING_STOPWORDS:
+    if MATCHING_LEFT_VERB_PATTERN.search(left_cleaned):
         return False
-    if MATCHING_BAD_LEFT_PREFIX_PATTERN.match(left_cleaned):
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _is_valid_matching_pair(left: str, right: str) -> bool:
+    # Pools are validated, selected, then re-validated: cache per (left, right).
+    # Cheap string checks run first; most rejected candidates never reach a regex.
+    left_cleaned = " ".join(left.split()).strip(" -:;,.")
+    right_cleaned = " ".join(right.split()).strip(" -:;,.")
+    if not left_cleaned or not right_cleaned:
         return False
-    if MATCHING_LEFT_VERB_PATTERN.search(left_cleaned):
+    right_word_count = right_cleaned.count(" ") + 1
+    if right_word_count < MATCHING_RIGHT_MIN_WORDS:
         return False
-    if left_key == right_key:
+    if not _is_valid_matching_left(left_cleaned):
         return False
-    if MATCHING_PLACEHOLDER_PATTERN.match(left_cleaned) or MATCHING_PLACEHOLDER_PATTERN.match(right_cleaned):
+    if MATCHING_WEAK_CERTAINTY_PATTERN.search(right_cleaned):
         return False
-    if right_cleaned.lower().startswith(("definition de ", "def de ", "desc de ")):
+
+    left_key = _normalize_identifier(left_cleaned)
+    right_key = _normalize_identifier(right_cleaned)
+    if not right_key:
         return False
-    if MATCHING_RIGHT_NOISY_START_PATTERN.match(right_cleaned):
+    if left_key == right_key:
         return False
-    if MATCHING_RIGHT_BAD_END_PATTERN.search(right_cleaned):
+    if MATCHING_RIGHT_REJECT_PREFIX_PATTERN.match(right_cleaned):
         return False
-    if len(right_cleaned.split()) < MATCHING_RIGHT_MIN_WORDS:
+    if right_cleaned.lower().startswith(("definition de ", "def de ", "desc de ")):
+        return False
+    if _has_bad_matching_right_end(right_cleaned):
         return False
-    if not _looks_definition_like_text(right_cleaned) and len(right_cleaned.split()) < 8:
+    if right_word_count < 8 and not _looks_definition_like_text(right_cleaned):
         return False
     if right_key.startswith(left_key):
         # Allow explicit predicate definitions after the concept label:
         # "Le routeur -> Le routeur oriente les paquets ...".
-        right_tail = re.sub(rf"^\s*{re.escape(left_cleaned)}\s*", "", right_cleaned, flags=re.IGNORECASE).strip()
+        right_tail = _strip_leading_label(right_cleaned, left_cleaned, with_separator=False).strip()
+        left_core = _strip_matching_leading_articles(left_cleaned)
         if left_core and right_tail == right_cleaned:
-            right_tail = re.sub(rf"^\s*{re.escape(left_core)}\s*", "", right_cleaned, flags=re.IGNORECASE).strip()
+            right_tail = _strip_leading_label(right_cleaned, left_core, with_separator=False).strip()
         if len(right_tail.split()) < 3:
             return False
         if MATCHING_RIGHT_NOISY_TAIL_PATTERN.match(right_tail):
             return False
-    if left_key in right_key and len(right_cleaned.split()) <= len(left_cleaned.split()) + 1:
+    if left_key in right_key and right_word_count <= left_cleaned.count(" ") + 2:
         return False
     return True
 
@@ -2532,20 +2949,22 @@ def _matching_pair_quality_score(left: str, right: str) -> int:
 
 
 def _select_best_matching_pairs(
-    candidates: list[tuple[int, str, str, int]],
+    candidates: Collection[tuple[int, str, str, int]],
     *,
     limit: int,
 ) -> list[tuple[str, str]]:
     if limit <= 0 or not candidates:
         return []
 
-    ranked = sorted(candidates, key=lambda row: (-row[3], row[0]))
+    # Best score first, ties by source order. Callers insert candidates with an
+    # increasing sequence, so one stable sort on the score is enough.
+    ranked = sorted(candidates, key=itemgetter(3), reverse=True)
     selected: list[tuple[int, str, str]] = []
     seen_left: set[str] = set()
     seen_right: set[str] = set()
 
     for index, left, right, _score in ranked:
-        left_id = _normalize_identifier(_strip_matching_leading_articles(left))
+        left_id = _matching_left_identifier(left)
         right_id = _normalize_identifier(right)
         if not left_id or not right_id:
             continue
@@ -2557,23 +2976,23 @@ def _select_best_matching_pairs(
         if len(selected) >= limit:
             break
 
-    selected.sort(key=lambda row: row[0])
+    selected.sort(key=itemgetter(0))
     return [(left, right) for _, left, right in selected]
 
 
-def _extract_pairs_from_blob(blob: str) -> list[tuple[str, str]]:
-    pairs: list[tuple[str, str]] = []
+def _extract_pairs_from_blob(blob: str) -> Iterator[tuple[str, str]]:
     if not blob.strip():
-        return pairs
+        return
 
-    for fragment in re.split(r"\s*(?:\|\||;;|;|\n)+\s*", blob):
+    for fragment in MATCHING_BLOB_SPLIT_PATTERN.split(blob):
         part = fragment.strip()
-        if not part:
+        # Every accepted separator contains one of these characters.
+        if not part or not MATCHING_PAIR_SEPARATOR_CHAR_PATTERN.search(part):
             continue
         for separator in ("->", "=>", "→", "-&gt;", "="):
-            if separator in part:
-                left_raw, right_raw = part.split(separator, 1)
-                pairs.append((left_raw, right_raw))
+            left_raw, found, right_raw = part.partition(separator)
+            if found:
+                yield left_raw, right_raw
                 break
         else:
             if ":" in part:
@@ -2589,7 +3008,7 @@ def _extract_pairs_from_blob(blob: str) -> list[tuple[str, str]]:
                     and "," not in left_raw
                     and "?" not in left_raw
                 ):
-                    pairs.append((left_raw, right_raw))
+                    yield left_raw, right_raw
                     continue
             if " - " in part:
                 left_raw, right_raw = part.split(" - ", 1)
@@ -2599,15 +3018,13 @@ def _extract_pairs_from_blob(blob: str) -> list[tuple[str, str]]:
                     min_words=1,
                 )
                 if left_candidate and not MATCHING_LEFT_VERB_PATTERN.search(left_candidate):
-                    pairs.append((left_raw, right_raw))
-    return pairs
+                    yield left_raw, right_raw
 
 
-def _extract_pairs_from_sentence(sentence: str) -> list[tuple[str, str]]:
-    pairs: list[tuple[str, str]] = []
+def _extract_pairs_from_sentence(sentence: str) -> Iterator[tuple[str, str]]:
     candidate = sentence.strip(" -:;,.")
     if not candidate:
-        return pairs
+        return
 
     if ":" in candidate:
         left, right = candidate.split(":", 1)
@@ -2623,7 +3040,7 @@ def _extract_pairs_from_sentence(sentence: str) -> list[tuple[str, str]]:
             and "?" not in left
             and not MATCHING_LEFT_VERB_PATTERN.search(left_candidate)
         ):
-            pairs.append((left, right))
+            yield left, right
 
     match = MATCHING_SENTENCE_PAIR_PATTERN.search(candidate)
     if match:
@@ -2632,16 +3049,25 @@ def _extract_pairs_from_sentence(sentence: str) -> list[tuple[str, str]]:
         if _looks_definition_like_text(right):
             left = _derive_matching_label(match.group(1).strip(" ,:-"))
             if left and right:
-                pairs.append((left, right))
+                yield left, right
 
     cest_a_dire_match = MATCHING_CEST_A_DIRE_PAIR_PATTERN.search(candidate)
     if cest_a_dire_match:
         left = _derive_matching_label(cest_a_dire_match.group(1).strip(" ,:-"))
         right = cest_a_dire_match.group(2).strip(" ,:-")
         if left and right and _looks_definition_like_text(f"c'est-a-dire {right}"):
-            pairs.append((left, right))
+            yield left, right
+
+
+def _select_matching_label_tokens(tokens: list[str]) -> list[str]:
+    """Keep the first three tokens that are long enough and not label noise."""
+
+    return list(islice((token for token in tokens if _is_matching_label_token(token)), 3))
+
 
-    return pairs
+def _is_matching_label_token(token: str) -> bool:
+    normalized = _normalize_identifier(token)
+    return len(normalized) >= 3 and normalized not in MATCHING_LABEL_SKIP_TOKENS
 
 
 def _derive_matching_label(sentence: str) -> str | None:
@@ -2663,21 +3089,7 @@ def _derive_matching_label(sentence: str) -> str | None:
     if not candidate:
         return None
 
-    tokens = re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9'-]+", candidate)
-    selected: list[str] = []
-    for token in tokens:
-        normalized = _normalize_identifier(token)
-        if len(normalized) < 3:
-            continue
-        if normalized in MATCHING_GENERIC_TOKEN_STOPWORDS:
-            continue
-        if normalized in MATCHING_LEFT_FORBIDDEN_TOKENS:
-            continue
-        if normalized in MATCHING_LABEL_BANNED_TOKENS:
-            continue
-        selected.append(token)
-        if len(selected) >= 3:
-            break
+    selected = _select_matching_label_tokens(MATCHING_WORD_TOKEN_PATTERN.findall(candidate))
 
     if len(selected) < 2:
         # Fallback: recover a noun phrase if the leading clause starts with
@@ -2692,21 +3104,7 @@ def _derive_matching_label(sentence: str) -> str | None:
             )
             if direct_label and not MATCHING_LEFT_VERB_PATTERN.search(direct_label):
                 return direct_label
-            fallback_tokens = re.findall(r"[A-Za-zÀ-ÖØ-öø-ÿ0-9'-]+", fallback_candidate)
-            selected = []
-            for token in fallback_tokens:
-                normalized = _normalize_identifier(token)
-                if len(normalized) < 3:
-                    continue
-                if normalized in MATCHING_GENERIC_TOKEN_STOPWORDS:
-                    continue
-                if normalized in MATCHING_LEFT_FORBIDDEN_TOKENS:
-                    continue
-                if normalized in MATCHING_LABEL_BANNED_TOKENS:
-                    continue
-                selected.append(token)
-                if len(selected) >= 3:
-                    break
+            selected = _select_matching_label_tokens(MATCHING_WORD_TOKEN_PATTERN.findall(fallback_candidate))
         if len(selected) == 1:
             return None
         if len(selected) < 2:
@@ -2727,12 +3125,10 @@ def _build_matching_fallback_pairs(source_text: str, *, desired_pairs: int = 4)
     """Build quality association pairs from full source sentences."""
 
     sentences = _split_informative_sentences(source_text, minimum_length=28, limit=80)
-    candidates: list[tuple[int, str, str, int]] = []
-    seen_exact: set[tuple[str, str]] = set()
-    sequence = 0
+    # Keyed by the lowercased pair: one dict both dedupes and keeps source order.
+    candidates: dict[tuple[str, str], tuple[int, str, str, int]] = {}
 
     def add_pair(left_raw: str, right_raw: str) -> None:
-        nonlocal sequence
         left = _normalize_matching_side(
             _normalize_matching_left_candidate(left_raw),
             max_words=8,
@@ -2741,23 +3137,24 @@ def _build_matching_fallback_pairs(source_text: str, *, desired_pairs: int = 4)
         if not left:
             return
         left = _normalize_matching_left_display(left)
+        # A label _is_valid_matching_pair would reject needs no definition clean-up.
+        if not _is_valid_matching_left(" ".join(left.split()).strip(" -:;,.")):
+            return
         right = _coerce_matching_definition(left, right_raw)
         if not right:
             return
         if not _is_valid_matching_pair(left, right):
             return
         key = (left.lower(), right.lower())
-        if key in seen_exact:
+        if key in candidates:
             return
-        seen_exact.add(key)
-        sequence += 1
-        candidates.append((sequence, left, right, _matching_pair_quality_score(left, right)))
+        candidates[key] = (len(candidates) + 1, left, right, _matching_pair_quality_score(left, right))
 
     for sentence in sentences:
         for left_raw, right_raw in _extract_pairs_from_sentence(sentence):
             add_pair(left_raw, right_raw)
 
-    used_rights = {right.lower() for _, _, right, _ in candidates}
+    used_rights = {right_key for _, right_key in candidates}
     for sentence in sentences:
         sentence_key = sentence.lower()
         if sentence_key in used_rights:
@@ -2773,25 +3170,23 @@ def _build_matching_fallback_pairs(source_text: str, *, desired_pairs: int = 4)
         if len(candidates) > before_count:
             used_rights.add(sentence_key)
 
-    selected = _select_best_matching_pairs(candidates, limit=max(2, desired_pairs))
+    selected = _select_best_matching_pairs(candidates.values(), limit=max(2, desired_pairs))
 
     if len(selected) < 2:
         context = sentences[0] if sentences else "Le document presente des notions importantes."
         add_pair("Concept principal", context)
         add_pair("Cas pratique", "Associer chaque notion a son role explicite dans le texte source.")
         add_pair("Exemple concret", "Relier chaque notion a une illustration concrete du document.")
-        selected = _select_best_matching_pairs(candidates, limit=max(2, desired_pairs))
+        selected = _select_best_matching_pairs(candidates.values(), limit=max(2, desired_pairs))
 
     return selected[: max(2, desired_pairs)]
 
 
 def _extract_matching_pairs(*, item: GeneratedItem, source_text: str) -> list[tuple[str, str]]:
-    candidates: list[tuple[int, str, str, int]] = []
-    seen_exact: set[tuple[str, str]] = set()
-    sequence = 0
+    # Keyed by the lowercased pair: one dict both dedupes and keeps source order.
+    candidates: dict[tuple[str, str], tuple[int, str, str, int]] = {}
 
     def add_pair(left_raw: str, right_raw: str) -> None:
-        nonlocal sequence
         left = _normalize_matching_side(
             _normalize_matching_left_candidate(left_raw),
             max_words=8,
@@ -2800,47 +3195,52 @@ def _extract_matching_pairs(*, item: GeneratedItem, source_text: str) -> list[tu
         if not left:
             return
         left = _normalize_matching_left_display(left)
+        # A label _is_valid_matching_pair would reject needs no definition clean-up.
+        if not _is_valid_matching_left(" ".join(left.split()).strip(" -:;,.")):
+            return
         right = _coerce_matching_definition(left, right_raw)
         if not right:
             return
         if not _is_valid_matching_pair(left, right):
             return
         key = (left.lower(), right.lower())
-        if key in seen_exact:
+        if key in candidates:
             return
-        seen_exact.add(key)
-        sequence += 1
-        candidates.append((sequence, left, right, _matching_pair_quality_score(left, right)))
+        candidates[key] = (len(candidates) + 1, left, right, _matching_pair_quality_score(left, right))
 
     raw_sources = [item.correct_answer or "", *item.answer_options, *item.distractors]
-    for candidate in raw_sources:
+    # Answer, options and distractors often repeat the same blob; a repeat
+    # could only yield pairs add_pair already rejects as seen.
+    for candidate in dict.fromkeys(raw_sources):
         for left_raw, right_raw in _extract_pairs_from_blob(candidate):
             add_pair(left_raw, right_raw)
 
-    selected = _select_best_matching_pairs(candidates, limit=8)
+    # The selection is deterministic and never returns more pairs than there
+    # are candidates: re-rank only when a stage added candidates and at least
+    # two exist (fewer would fall through to the next stage either way).
+    selected = _select_best_matching_pairs(candidates.values(), limit=8) if len(candidates) >= 2 else []
 
+    sanitized_source = _sanitize_source_for_generation(source_text)
     if len(selected) < 3:
-        for sentence in _split_informative_sentences(
-            _sanitize_source_for_generation(source_text), minimum_length=28, limit=80
-        ):
+        candidate_count = len(candidates)
+        for sentence in _split_informative_sentences(sanitized_source, minimum_length=28, limit=80):
             for left_raw, right_raw in _extract_pairs_from_sentence(sentence):
                 add_pair(left_raw, right_raw)
-        selected = _select_best_matching_pairs(candidates, limit=8)
+        if len(candidates) != candidate_count and len(candidates) >= 2:
+            selected = _select_best_matching_pairs(candidates.values(), limit=8)
 
     if len(selected) < 2:
+        candidate_count = len(candidates)
         for left_raw, right_raw in _build_matching_fallback_pairs(
-            source_text=_sanitize_source_for_generation(source_text),
+            source_text=sanitized_source,
             desired_pairs=4,
         ):
             add_pair(left_raw, right_raw)
-        selected = _select_best_matching_pairs(candidates, limit=8)
+        if len(candidates) != candidate_count and len(candidates) >= 2:
+            selected = _select_best_matching_pairs(candidates.values(), limit=8)
 
     if len(selected) < 2:
-        return [
-            ("Concept principal", "Definition complete basee sur le texte source."),
-            ("Notion cle", "Lien explicite avec le contenu pedagogique fourni."),
-            ("Exemple concret", "Illustration precise qui aide a valider la comprehension."),
-        ]
+        return list(DEFAULT_MATCHING_PAIRS)
     return selected[:8]
 
 
@@ -2848,33 +3248,28 @@ def _matching_pairs_need_fallback(pairs: list[tuple[str, str]]) -> bool:
     if len(pairs) < 2:
         return True
 
-    if any(not _is_valid_matching_pair(left, right) for left, right in pairs):
-        return True
-
+    # One pass: every per-pair failure (invalid pair, empty or duplicated
+    # identifier, weak definition) already decides the answer.
+    weak_definition = MATCHING_WEAK_DEFINITION_PATTERN.match
     unique_left: set[str] = set()
     unique_right: set[str] = set()
-    for left, _ in pairs:
-        normalized = _normalize_identifier(_strip_matching_leading_articles(left))
-        if normalized:
-            unique_left.add(normalized)
-    for _, right in pairs:
-        normalized = _normalize_identifier(right)
-        if normalized:
-            unique_right.add(normalized)
-    if len(unique_left) < 3:
-        return True
-    if len(unique_left) != len(pairs):
-        return True
-    if len(unique_right) != len(pairs):
-        return True
+    right_words = 0
+    for left, right in pairs:
+        if not _is_valid_matching_pair(left, right):
+            return True
+        left_key = _matching_left_identifier(left)
+        right_key = _normalize_identifier(right)
+        if not left_key or left_key in unique_left or not right_key or right_key in unique_right:
+            return True
+        if weak_definition(right.strip()):
+            return True
+        unique_left.add(left_key)
+        unique_right.add(right_key)
+        right_words += len(right.split())
 
-    average_right_words = sum(len(right.split()) for _, right in pairs) / max(1, len(pairs))
-    if average_right_words < MATCHING_RIGHT_MIN_WORDS:
-        return True
-    if any(MATCHING_WEAK_DEFINITION_PATTERN.match(right.strip()) for _, right in pairs):
+    if len(pairs) < 3:
         return True
-
-    return False
+    return right_words / len(pairs) < MATCHING_RIGHT_MIN_WORDS
 
 
 def _matching_pairs_are_exportable(pairs: list[tuple[str, str]]) -> bool:
@@ -2882,52 +3277,48 @@ def _matching_pairs_are_exportable(pairs: list[tuple[str, str]]) -> bool:
 
     if len(pairs) < 2:
         return False
-    if any(not _is_valid_matching_pair(left, right) for left, right in pairs):
-        return False
 
     unique_left: set[str] = set()
     unique_right: set[str] = set()
-    for left, _ in pairs:
-        normalized = _normalize_identifier(_strip_matching_leading_articles(left))
-        if normalized:
-            unique_left.add(normalized)
-    for _, right in pairs:
-        normalized = _normalize_identifier(right)
-        if normalized:
-            unique_right.add(normalized)
-
-    return len(unique_left) == len(pairs) and len(unique_right) == len(pairs)
+    for left, right in pairs:
+        if not _is_valid_matching_pair(left, right):
+            return False
+        left_key = _matching_left_identifier(left)
+        right_key = _normalize_identifier(right)
+        if not left_key or left_key in unique_left or not right_key or right_key in unique_right:
+            return False
+        unique_left.add(left_key)
+        unique_right.add(right_key)
+    return True
 
 
 def _matching_pairs_are_pronote_ready(pairs: list[tuple[str, str]]) -> bool:
     """Stricter quality gate for Pronote association mode."""
 
-    if not _matching_pairs_are_exportable(pairs):
-        return False
     if len(pairs) < 2:
         return False
 
-    right_lengths = [len(right.split()) for _, right in pairs]
-    if not right_lengths:
-        return False
-    if min(right_lengths) < MATCHING_RIGHT_MIN_WORDS:
-        return False
-    if (sum(right_lengths) / len(right_lengths)) < 4:
-        return False
-
+    # Fuses the exportable checks with the per-pair quality checks in one pass.
+    weak_certainty = MATCHING_WEAK_CERTAINTY_PATTERN.search
+    unique_left: set[str] = set()
+    unique_right: set[str] = set()
+    total_right_words = 0
     for left, right in pairs:
-        left_key = _normalize_identifier(_strip_matching_leading_articles(left))
+        if not _is_valid_matching_pair(left, right):
+            return False
+        left_key = _matching_left_identifier(left)
         right_key = _normalize_identifier(right)
-        if not left_key or not right_key:
+        if not left_key or left_key in unique_left or not right_key or right_key in unique_right:
             return False
-        if left_key in right_key and len(right.split()) <= len(left.split()) + 2:
+        unique_left.add(left_key)
+        unique_right.add(right_key)
+        right_words = len(right.split())
+        if right_words < MATCHING_RIGHT_MIN_WORDS:
             return False
-        if MATCHING_WEAK_CERTAINTY_PATTERN.search(right):
+        if left_key in right_key and right_words <= len(left.split()) + 2:
             return False
+        if weak_certainty(right):
+            return False
+        total_right_words += right_words
 
-    return True
-
-
-def _build_association_prompt_from_pairs(pairs: list[tuple[str, str]]) -> str:
-    """Create a concise association prompt from the selected notions."""
-    return "Associez chaque notion du texte a sa definition ou a sa caracteristique correspondante."
+    return total_right_words / len(pairs) >= 4
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 import hashlib
 import html
@@ -67,6 +68,7 @@ BOT_CHALLENGE_PATTERNS = (
 MAX_YOUTUBE_TRANSCRIPT_CHARS = 22000
 YOUTUBE_TRANSCRIPT_LANGUAGES = ("fr", "fr-FR", "en", "en-US")
 SUBTITLE_EXT_PRIORITY = ("vtt", "srv3", "ttml", "json3")
+OCR_MAX_WORKERS = 4
 
 
 @dataclass(slots=True)
@@ -373,9 +375,20 @@ def _ocr_pdf_payload(payload: bytes, *, ocr_language: str) -> tuple[str | None,
 
     try:
         pages = convert_from_bytes(payload, fmt="png", first_page=1, last_page=8)
+
+        def recognize(page: object) -> str:
+            return pytesseract.image_to_string(page, lang=ocr_language)  # type: ignore[arg-type,union-attr]
+
+        # Each page is an independent tesseract subprocess: run them side by side.
+        if len(pages) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(OCR_MAX_WORKERS, len(pages)), thread_name_prefix="ocr-pdf"
+            ) as executor:
+                texts = list(executor.map(recognize, pages))
+        else:
+            texts = [recognize(page) for page in pages]
         snippets: list[str] = []
-        for page in pages:
-            text = pytesseract.image_to_string(page, lang=ocr_language)  # type: ignore[arg-type]
+        for text in texts:
             cleaned = _normalize_whitespace(text)
             if cleaned:
                 snippets.append(cleaned)